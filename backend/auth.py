@@ -2,12 +2,23 @@
 Authentication utilities - JWT and password hashing
 """
 import bcrypt
+import hashlib
 import jwt
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from threading import Lock
 from fastapi import HTTPException
-from typing import Optional
+from typing import Optional, Tuple
 from config import JWT_SECRET, JWT_ALGO, JWT_EXPIRY_HOURS
 
+# Token digest -> (payload, cache expiry timestamp); most recently used last.
+# Keys are hashes so raw bearer tokens are never held in memory by the cache.
+_TOKEN_CACHE: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+_TOKEN_CACHE_MAX = 10_000
+_TOKEN_CACHE_TTL = 30  # seconds; bounds how long a cached verification is trusted
+_TOKEN_CACHE_LOCK = Lock()
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
@@ -41,3 +52,32 @@ def decode_token(token: str) -> dict:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+
+def cached_decode_token(token: str) -> dict:
+    """Decode JWT token, reusing the verified payload until the token expires.
+
+    Only successfully verified tokens are cached, so invalid or expired tokens
+    always go through decode_token and raise the same 401 errors. Entries live
+    for at most _TOKEN_CACHE_TTL seconds and never past the token's exp.
+    """
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).hexdigest()
+    now = time.time()
+    with _TOKEN_CACHE_LOCK:
+        hit = _TOKEN_CACHE.get(key)
+        if hit is not None:
+            payload, expires_at = hit
+            if expires_at > now:
+                _TOKEN_CACHE.move_to_end(key)
+                return dict(payload)
+            del _TOKEN_CACHE[key]
+
+    decoded = decode_token(token)
+    exp = decoded.get("exp")
+    if isinstance(exp, (int, float)):
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[key] = (dict(decoded), min(now + _TOKEN_CACHE_TTL, float(exp)))
+            _TOKEN_CACHE.move_to_end(key)
+            if len(_TOKEN_CACHE) > _TOKEN_CACHE_MAX:
+                _TOKEN_CACHE.popitem(last=False)
+    return decoded
@@ -1,5 +1,6 @@
 
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from config import MONGO_URI, DB_NAME
 
 # MongoDB connection
@@ -15,13 +16,45 @@ annotations_col = db["annotations"]
 workspaces_col = db["workspaces"]  # workspaces per user
 feedback_col = db["feedback"]  # user feedback on model predictions
 active_learning_corrections_col = db["active_learning_corrections"]  # corrected training data from active learning
+otp_col = db["password_reset_otps"]  # password reset OTPs
+
+# Async (Motor) client for async def handlers; shares the same database
+async_client = AsyncIOMotorClient(MONGO_URI)
+async_db = async_client[DB_NAME]
+users_col_async = async_db["users"]
+projects_col_async = async_db["projects"]
+otp_col_async = async_db["password_reset_otps"]  # password reset OTPs
 
 # Suggested indexes (idempotent ensure) - safe to call at import time
-try:
-	workspaces_col.create_index("owner_email")
-	datasets_col.create_index([("workspace_id", 1), ("checksum", 1)])
-	# Compound index for efficient workspace-specific feedback queries
-	feedback_col.create_index([("owner_email", 1), ("workspace_id", 1), ("created_at", -1)])
-except Exception:
-	# Non-fatal if index creation fails (e.g., limited permissions)
-	pass
+def _ensure_index(col, keys, **kwargs):
+	try:
+		col.create_index(keys, **kwargs)
+	except Exception:
+		# Non-fatal if index creation fails (e.g., limited permissions or
+		# existing duplicates for a unique index); keep creating the others
+		pass
+
+
+def _ensure_unique_workspace_owner():
+	# One root workspace document per user. Older deployments created a plain
+	# owner_email index; MongoDB will not change its options in place, so swap it.
+	try:
+		info = workspaces_col.index_information().get("owner_email_1")
+		if info and not info.get("unique"):
+			workspaces_col.drop_index("owner_email_1")
+		workspaces_col.create_index("owner_email", unique=True)
+	except Exception:
+		# e.g. pre-existing duplicate root docs; keep a non-unique index instead
+		_ensure_index(workspaces_col, "owner_email")
+
+
+_ensure_unique_workspace_owner()
+_ensure_index(datasets_col, [("workspace_id", 1), ("checksum", 1)])
+# Compound index for efficient workspace-specific feedback queries
+_ensure_index(feedback_col, [("owner_email", 1), ("workspace_id", 1), ("created_at", -1)])
+# Login/registration and password reset look users and OTPs up by email
+_ensure_index(users_col, "email", unique=True)
+_ensure_index(otp_col, "email", unique=True)
+# TTL: Mongo purges each OTP once its expires_at has passed
+_ensure_index(otp_col, "expires_at", expireAfterSeconds=0)
+_ensure_index(projects_col, "owner_email")
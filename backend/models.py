@@ -3,6 +3,8 @@ from pydantic import BaseModel, EmailStr, field_validator, ConfigDict
 from typing import Optional, Any, Dict
 import re
 
+_SPECIAL_CHAR_RE = re.compile(r"[^\w\s]")
+
 
 class RegisterRequest(BaseModel):
     """User registration request model"""
@@ -22,7 +24,7 @@ class RegisterRequest(BaseModel):
     @field_validator("password")
     @classmethod
     def password_strength(cls, value: str) -> str:
-        if len(value) < 6 or not re.search(r"[^\w\s]", value):
+        if len(value) < 6 or not _SPECIAL_CHAR_RE.search(value):
             raise ValueError("Password must be at least 6 characters and include at least one special character.")
         return value
 
@@ -4,7 +4,7 @@ from typing import Annotated, List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Header, status
 from pydantic import BaseModel
 
-from auth import decode_token
+from auth import cached_decode_token
 from database import active_learning_corrections_col, workspaces_col
 from .nlu_routes import BatchPredictPayload, predict_batch  # type: ignore
 
@@ -45,7 +45,7 @@ def suggest_uncertain_samples(payload: SuggestRequest, authorization: Authorizat
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decode_token(token)
+    cached_decode_token(token)
 
     if not payload.texts:
         raise HTTPException(status_code=400, detail="texts must be non-empty")
@@ -136,7 +136,7 @@ def save_corrections(payload: SaveFeedbackRequest, authorization: AuthorizationH
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
     
     email = decoded.get("email")
     if not email:
@@ -188,7 +188,7 @@ def get_corrections(authorization: AuthorizationHeader = None):
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
     
     email = decoded.get("email")
     if not email:
@@ -9,7 +9,7 @@ from bson import ObjectId
 import io
 import json
 
-from auth import decode_token, hash_password
+from auth import cached_decode_token, hash_password
 from database import users_col, workspaces_col, datasets_col, dataset_sentences_col, feedback_col, annotations_col
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -23,7 +23,7 @@ def verify_admin(authorization: AuthorizationHeader):
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
     email = decoded.get("email")
     
     if not email:
@@ -368,7 +368,10 @@ def delete_workspace_dataset(workspace_id: str, checksum: str, authorization: Au
     # Delete from dataset_sentences collection (nested arrays) - remove specific entry by checksum
     result2 = dataset_sentences_col.update_many(
         {"entries.workspace_id": workspace_id, "entries.checksum": checksum},
-        {"$pull": {"entries": {"workspace_id": workspace_id, "checksum": checksum}}}
+        {
+            "$pull": {"entries": {"workspace_id": workspace_id, "checksum": checksum}},
+            "$set": {"updated_at": datetime.utcnow()},
+        }
     )
     
     # Clean up documents with empty entries arrays
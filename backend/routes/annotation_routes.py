@@ -3,7 +3,7 @@ from fastapi import APIRouter, HTTPException, status, Header
 from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel
-from auth import decode_token
+from auth import cached_decode_token
 from database import annotations_col, dataset_sentences_col
 
 router = APIRouter()
@@ -32,7 +32,7 @@ def save_annotations(data: SaveAnnotationsRequest, authorization: AuthorizationH
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     # Verify dataset exists in dataset_sentences collection
     dataset = dataset_sentences_col.find_one({"owner_email": decoded["email"]})
@@ -95,7 +95,7 @@ def get_annotations(dataset_checksum: str, authorization: AuthorizationHeader =
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     annotation_doc = annotations_col.find_one({
         "owner_email": decoded["email"],
@@ -112,7 +112,7 @@ def export_annotations(dataset_checksum: str, authorization: AuthorizationHeader
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     annotation_doc = annotations_col.find_one({
         "owner_email": decoded["email"],
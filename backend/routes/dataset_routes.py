@@ -1,35 +1,90 @@
 """
 Dataset management routes
 """
-from fastapi import APIRouter, HTTPException, status, Header, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Header, UploadFile, File, Response
+from fastapi.responses import ORJSONResponse
 from typing import Annotated, Optional
 from datetime import datetime
+import hashlib
 import jwt
 import os
+import re
 import shutil
 from pathlib import Path
 from models import DatasetPayload, DatasetSelection
-from auth import decode_token
-from database import dataset_sentences_col, datasets_col
+from auth import cached_decode_token
+from database import dataset_sentences_col, datasets_col, workspaces_col
 from config import JWT_SECRET, JWT_ALGO
 
 router = APIRouter()
 
 AuthorizationHeader = Annotated[Optional[str], Header(alias="Authorization")]
+IfNoneMatchHeader = Annotated[Optional[str], Header(alias="If-None-Match")]
 
 # Create uploaded_files directory if it doesn't exist
 UPLOADED_FILES_DIR = Path(__file__).parent.parent.parent / "uploaded_files"
 UPLOADED_FILES_DIR.mkdir(exist_ok=True)
 
+# Number of recent datasets kept per user
+MAX_RECENT_DATASETS = 5
+
+# Column names treated as the sentence column when only a sample is sent
+_TEXT_FIELD_RE = re.compile(r"text|utterance|sentence|query|message")
+
+# GET /datasets only lists history, so leave out the per-entry sentence arrays
+_HISTORY_PROJECTION = {"_id": 0, "entries.sentences": 0, "selected.sentences": 0, "selected_by_workspace": 0}
+
+
+def _push_recent(entries, new_entry, checksum, filename):
+    """Put new_entry first and keep the most recent others, dropping same checksum/filename, in one pass"""
+    recent = [new_entry]
+    for item in entries:
+        if item.get("checksum") == checksum:
+            continue
+        if filename and item.get("filename") == filename:
+            continue
+        recent.append(item)
+        if len(recent) >= MAX_RECENT_DATASETS:
+            break
+    return recent
+
+
+def _scope_history(email, workspace_id, dataset):
+    """Shape a history document as GET /datasets returns it (entries/selected scoped to the workspace)"""
+    if dataset and workspace_id:
+        # Filter entries by workspace_id
+        filtered_entries = [e for e in dataset.get("entries", []) if e.get("workspace_id") == workspace_id]
+        if filtered_entries:
+            # Adjust selected if not in filtered list
+            selected = dataset.get("selected")
+            if not selected or selected.get("workspace_id") != workspace_id:
+                selected = filtered_entries[0]
+            dataset = {
+                "owner_email": email,
+                "entries": filtered_entries,
+                "selected": selected,
+                "updated_at": dataset.get("updated_at"),
+            }
+    return dataset or {}
+
+
+def _datasets_etag(email, workspace_id, dataset):
+    """Weak ETag for GET /datasets; keyed on updated_at and the entry checksums so removed entries invalidate it too"""
+    dataset = dataset or {}
+    selected = dataset.get("selected") or {}
+    checksums = ",".join(str(e.get("checksum")) for e in dataset.get("entries", []))
+    key = f"{email}|{workspace_id}|{selected.get('checksum')}|{dataset.get('updated_at')}|{checksums}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+
 
 @router.post("/datasets", status_code=status.HTTP_201_CREATED)
-def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None):
+def save_dataset(data: DatasetPayload, response: Response, authorization: AuthorizationHeader = None):
     """Persist complete dataset with intents, entities, and sentences"""
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     # Extract ALL sentences and (if provided) full records from the analysis data
     sentences = []
@@ -40,12 +95,10 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
         sample_data = data.analysis["sample"]
         if isinstance(sample_data, list) and len(sample_data) > 0:
             first_record = sample_data[0]
-            text_fields = [k for k in first_record.keys() if any(keyword in k.lower() for keyword in ["text", "utterance", "sentence", "query", "message"])]
+            text_field = next((k for k in first_record.keys() if _TEXT_FIELD_RE.search(k.lower())), None)
             
-            if text_fields:
-                text_field = text_fields[0]
-                sentences = [str(record.get(text_field, "")).strip() for record in sample_data if record.get(text_field)]
-                sentences = [s for s in sentences if s]
+            if text_field:
+                sentences = [s for s in (str(record[text_field]).strip() for record in sample_data if record.get(text_field)) if s]
     # Optional full records (complete rows) for better reload fidelity
     if data.analysis and isinstance(data.analysis, dict) and data.analysis.get("full_records"):
         try:
@@ -54,7 +107,8 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
         except Exception:
             full_records = []
 
-    checksum = data.checksum or jwt.encode({"filename": data.filename, "timestamp": datetime.utcnow().timestamp()}, JWT_SECRET, algorithm=JWT_ALGO)
+    now = datetime.utcnow()
+    checksum = data.checksum or jwt.encode({"filename": data.filename, "timestamp": now.timestamp()}, JWT_SECRET, algorithm=JWT_ALGO)
     
     # Extract intents and entities from analysis
     intents = data.analysis.get("intents", []) if data.analysis else []
@@ -66,7 +120,6 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
     
     # Create complete dataset entry with actual content
     # Determine active workspace (optional scoping)
-    from database import workspaces_col
     workspace_id = None
     try:
         root_ws = workspaces_col.find_one({"owner_email": decoded["email"]}) or {}
@@ -81,8 +134,8 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
         "owner_email": decoded["email"],
         "filename": data.filename,
         "checksum": checksum,
-        "uploaded_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+        "uploaded_at": now,
+        "updated_at": now,
         "workspace_id": workspace_id,
         
         # Dataset statistics
@@ -122,24 +175,14 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
         "filename": data.filename,
         "sentences": sentences,
         "sentence_count": len(sentences),
-        "updated_at": datetime.utcnow(),
+        "updated_at": now,
         "checksum": checksum,
         "workspace_id": workspace_id,
     }
     
     existing_sentences = dataset_sentences_col.find_one({"owner_email": decoded["email"]})
     if existing_sentences:
-        entries = existing_sentences.get("entries", [])
-        deduped = []
-        for item in entries:
-            if item.get("checksum") == checksum:
-                continue
-            if data.filename and item.get("filename") == data.filename:
-                continue
-            deduped.append(item)
-
-        deduped.insert(0, sentences_entry)
-        deduped = deduped[:5]
+        deduped = _push_recent(existing_sentences.get("entries", []), sentences_entry, checksum, data.filename)
 
         # Preserve selection per workspace if possible
         selected_by_workspace = existing_sentences.get("selected_by_workspace", {})
@@ -158,7 +201,7 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
             "owner_email": decoded["email"],
             "entries": deduped,
             "selected": selected_entry,
-            "updated_at": datetime.utcnow(),
+            "updated_at": now,
         }
         if workspace_id:
             update_doc[f"selected_by_workspace.{workspace_id}"] = selected_entry
@@ -172,7 +215,7 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
             "owner_email": decoded["email"],
             "entries": [sentences_entry],
             "selected": sentences_entry,
-            "updated_at": datetime.utcnow(),
+            "updated_at": now,
         }
         if workspace_id:
             base_doc["selected_by_workspace"] = {workspace_id: sentences_entry}
@@ -181,65 +224,57 @@ def save_dataset(data: DatasetPayload, authorization: AuthorizationHeader = None
     # Save to datasets collection (complete dataset with intents, entities, etc.)
     existing_datasets = datasets_col.find_one({"owner_email": decoded["email"]})
     if existing_datasets:
-        dataset_entries = existing_datasets.get("datasets", [])
-        dataset_deduped = []
-        for item in dataset_entries:
-            if item.get("checksum") == checksum:
-                continue
-            if data.filename and item.get("filename") == data.filename:
-                continue
-            dataset_deduped.append(item)
-
-        dataset_deduped.insert(0, dataset_entry)
-        dataset_deduped = dataset_deduped[:5]  # Keep last 5 datasets
+        dataset_deduped = _push_recent(existing_datasets.get("datasets", []), dataset_entry, checksum, data.filename)
 
         datasets_col.update_one(
             {"owner_email": decoded["email"]},
-            {"$set": {"datasets": dataset_deduped, "updated_at": datetime.utcnow()}}
+            {"$set": {"datasets": dataset_deduped, "updated_at": now}}
         )
     else:
         datasets_col.insert_one({
             "owner_email": decoded["email"],
             "datasets": [dataset_entry],
-            "updated_at": datetime.utcnow(),
+            "updated_at": now,
         })
 
-    return {"message": "Dataset saved successfully", "checksum": checksum}
+    # Return the refreshed history (same body + ETag as GET /datasets) so the client
+    # can show it without a follow-up GET, or revalidate it with a bodiless 304
+    history = dataset_sentences_col.find_one({"owner_email": decoded["email"]}, _HISTORY_PROJECTION)
+    response.headers["ETag"] = _datasets_etag(decoded["email"], workspace_id, history)
+
+    return {
+        "message": "Dataset saved successfully",
+        "checksum": checksum,
+        "history": _scope_history(decoded["email"], workspace_id, history),
+    }
 
 
 @router.get("/datasets")
-def get_dataset(authorization: AuthorizationHeader = None):
+def get_dataset(response: Response, authorization: AuthorizationHeader = None, if_none_match: IfNoneMatchHeader = None):
     """Retrieve persisted dataset summary for a user (workspace scoped if selected)"""
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     workspace_id = None
-    from database import workspaces_col
     try:
         root_ws = workspaces_col.find_one({"owner_email": decoded["email"]}) or {}
         workspace_id = root_ws.get("selected_workspace_id")
     except Exception:
         workspace_id = None
 
-    dataset = dataset_sentences_col.find_one({"owner_email": decoded["email"]}, {"_id": 0})
-    if dataset and workspace_id:
-        # Filter entries by workspace_id
-        filtered_entries = [e for e in dataset.get("entries", []) if e.get("workspace_id") == workspace_id]
-        if filtered_entries:
-            # Adjust selected if not in filtered list
-            selected = dataset.get("selected")
-            if not selected or selected.get("workspace_id") != workspace_id:
-                selected = filtered_entries[0]
-            dataset = {
-                "owner_email": decoded["email"],
-                "entries": filtered_entries,
-                "selected": selected,
-                "updated_at": dataset.get("updated_at"),
-            }
-    return dataset or {}
+    dataset = dataset_sentences_col.find_one({"owner_email": decoded["email"]}, _HISTORY_PROJECTION)
+
+    # Conditional GET: skip re-sending entries + selected when the client copy is current
+    etag = _datasets_etag(decoded["email"], workspace_id, dataset)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+    return _scope_history(decoded["email"], workspace_id, dataset)
 
 
 @router.post("/datasets/select")
@@ -249,7 +284,7 @@ def set_selected_dataset(data: DatasetSelection, authorization: AuthorizationHea
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     dataset = dataset_sentences_col.find_one({"owner_email": decoded["email"]})
     if not dataset:
@@ -257,7 +292,6 @@ def set_selected_dataset(data: DatasetSelection, authorization: AuthorizationHea
 
     # Workspace-aware selection
     workspace_id = None
-    from database import workspaces_col
     try:
         root_ws = workspaces_col.find_one({"owner_email": decoded["email"]}) or {}
         workspace_id = root_ws.get("selected_workspace_id")
@@ -290,7 +324,7 @@ def get_complete_dataset(checksum: str, authorization: AuthorizationHeader = Non
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     dataset = datasets_col.find_one({"owner_email": decoded["email"]})
     if not dataset:
@@ -298,7 +332,6 @@ def get_complete_dataset(checksum: str, authorization: AuthorizationHeader = Non
 
     datasets_list = dataset.get("datasets", [])
     # Optional workspace scoping for complete view
-    from database import workspaces_col
     try:
         root_ws = workspaces_col.find_one({"owner_email": decoded["email"]}) or {}
         workspace_id = root_ws.get("selected_workspace_id")
@@ -314,4 +347,6 @@ def get_complete_dataset(checksum: str, authorization: AuthorizationHeader = Non
     # Remove _id from response
     target_dataset.pop("_id", None)
     
-    return target_dataset
+    # Full records can be large; returning the response directly lets orjson encode
+    # them in one native pass instead of FastAPI's jsonable_encoder walk + json.dumps
+    return ORJSONResponse(target_dataset)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from sklearn.model_selection import train_test_split
@@ -78,18 +79,13 @@ def per_intent_report(y_true: List[str], y_pred: List[str]) -> List[Dict[str, An
             for l in labels
         ]
 
-    rows = []
-    for i, label in enumerate(labels):
-        rows.append(
-            {
-                "intent": label,
-                "precision": safe_round(float(prec[i])),
-                "recall": safe_round(float(rec[i])),
-                "f1": safe_round(float(f1[i])),
-                "support": int(support[i]),
-            }
-        )
-    return rows
+    # Sanitize whole columns at once (same NaN/inf -> 0.0 rule as safe_round) and
+    # convert them to Python numbers with tolist() instead of per-element casts
+    prec, rec, f1 = (np.nan_to_num(np.asarray(col, dtype=float), nan=0.0, posinf=0.0, neginf=0.0).tolist() for col in (prec, rec, f1))
+    return [
+        {"intent": label, "precision": p, "recall": r, "f1": f, "support": s}
+        for label, p, r, f, s in zip(labels, prec, rec, f1, np.asarray(support, dtype=int).tolist())
+    ]
 
 
 def build_confusion(y_true: List[str], y_pred: List[str], labels: Optional[List[str]] = None):
@@ -117,8 +113,14 @@ def run_evaluation(req: EvalRequest, authorization: Optional[str] = Header(None)
     indices = np.arange(n)
     train_frac = float(max(0, min(100, req.train_pct))) / 100.0
 
+    # Stratify on int32 intent codes (categorical encoding) rather than a
+    # fixed-width unicode array sized by the longest intent name; codes follow
+    # sorted intent order, as np.unique would, so seeded splits are unchanged
+    intent_codes = {intent: code for code, intent in enumerate(sorted(set(req.true_intents)))}
+    codes = np.fromiter((intent_codes[intent] for intent in req.true_intents), dtype=np.int32, count=n)
+
     try:
-        stratify = np.array(req.true_intents) if len(set(req.true_intents)) > 1 else None
+        stratify = codes if len(intent_codes) > 1 else None
         train_idx, test_idx = train_test_split(
             indices,
             train_size=train_frac,
@@ -199,7 +201,10 @@ def run_evaluation(req: EvalRequest, authorization: Optional[str] = Header(None)
             "match": (t_lab == p_lab),
         })
 
-    return {
+    # Every test sample is echoed back several times (details, y_true/y_pred, X_test);
+    # returning the response directly lets orjson encode it in one native pass
+    # instead of FastAPI's jsonable_encoder walk + json.dumps
+    return ORJSONResponse({
         "model": req.model_id,
         "metrics": metrics,
         "train_samples": len(X_train),
@@ -210,7 +215,7 @@ def run_evaluation(req: EvalRequest, authorization: Optional[str] = Header(None)
         "y_true": true_intents,
         "y_pred": predicted_intents,
         "X_test": X_test,
-    }
+    })
 
 
 # ---------- NEW ENDPOINT: save model comparison data ----------
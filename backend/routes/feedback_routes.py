@@ -4,7 +4,7 @@ from typing import Annotated, List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Header, status
 from pydantic import BaseModel
 
-from auth import decode_token
+from auth import cached_decode_token
 from database import feedback_col, workspaces_col
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
@@ -31,7 +31,7 @@ def save_feedback(payload: SaveFeedbackRequest, authorization: AuthorizationHead
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
     
     email = decoded.get("email")
     if not email:
@@ -80,7 +80,7 @@ def get_feedback(authorization: AuthorizationHeader = None):
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
     
     email = decoded.get("email")
     if not email:
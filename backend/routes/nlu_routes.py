@@ -1,44 +1,88 @@
 from fastapi import APIRouter, HTTPException, status, Header
-from typing import Annotated, Optional, List, Dict, Any, Tuple
+from typing import Annotated, Optional, List, Dict, Any, Iterable, Tuple
 from pydantic import BaseModel
-from auth import decode_token
+from auth import cached_decode_token
 
 # Lightweight runtime: spaCy for NER + rule-based intents (no transformers)
 import os
-from threading import Lock
+import re
+import string
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import RLock
+import ahocorasick
+import numpy as np
 import spacy
-import json
+from spacy.util import minibatch
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 
-# Lazy spaCy model loader
-_nlp = None
-_nlp_lock = Lock()
 
-# Optional lazy loaders for other engines
-_rasa_loaded = False
-_rasa_interpreter = None
-_rasa_error: Optional[str] = None
+@dataclass
+class NLUState:
+    """All loaded/trained NLU models for this worker process.
 
-_crf_loaded = False
-_crf_model = None
-_crf_error: Optional[str] = None
-
-# Lightweight spaCy textcat trained per-session for evaluation
-_spacy_textcat = None
-_spacy_textcat_nlp = None
-
-# Lightweight intent classifiers trained on-the-fly
-_rasa_intent_model = None
-_rasa_intent_labels: Optional[List[str]] = None
+    Model/label pairs are stored as tuples and always replaced together, so a
+    handler that unpacks ``_state.nert_intent`` once can never see a model from
+    one training run paired with labels from another.
+    """
+    # Lazy spaCy model loader
+    nlp: Any = None
+    # Optional lazy loaders for other engines
+    rasa_loaded: bool = False
+    rasa_interpreter: Any = None
+    rasa_error: Optional[str] = None
+    crf_loaded: bool = False
+    crf: Any = None
+    crf_error: Optional[str] = None
+    # Lightweight spaCy textcat trained per-session for evaluation: (textcat, nlp)
+    textcat: Tuple[Any, Any] = (None, None)
+    # Lightweight intent classifiers trained on-the-fly: (model, labels)
+    rasa_intent: Tuple[Any, Optional[List[str]]] = (None, None)
+    nert_intent: Tuple[Any, Optional[List[str]]] = (None, None)
+    # Bumped whenever an intent model is replaced; part of the prediction cache key
+    generation: int = 0
+    lock: RLock = field(default_factory=RLock, repr=False, compare=False)
+
+
+_state = NLUState()
+
+# Keep-alive connection pool for the optional external Rasa server. Sized for
+# the request threadpool; /model/parse is read-only, so POSTs are safe to retry.
+_RASA_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+_rasa_session = requests.Session()
+_rasa_session.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=frozenset({"POST"})),
+))
+_rasa_session.mount("https://", _rasa_session.get_adapter("http://"))
+
+
+_INTENT_MODEL_FIELDS = frozenset({"textcat", "rasa_intent", "nert_intent"})
+
+
+def _swap(**values: Any) -> None:
+    """Atomically replace one or more fields of the shared NLU state."""
+    with _state.lock:
+        for name, value in values.items():
+            setattr(_state, name, value)
+        if _INTENT_MODEL_FIELDS.intersection(values):
+            _state.generation += 1
+            _cached_intent.cache_clear()
+
+
+# Components of the en_core_web_* pipelines that _spacy_entities never reads
+_SPACY_UNUSED_PIPES = ("tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer")
 
-_nert_intent_model = None
-_nert_intent_labels: Optional[List[str]] = None
 
 def get_spacy_nlp():
-    global _nlp
-    if _nlp is None:
-        with _nlp_lock:
-            if _nlp is None:
+    if _state.nlp is None:
+        with _state.lock:
+            if _state.nlp is None:
                 try:
                     # Prefer large model on Windows-friendly setup; allow override via SPACY_MODEL
                     preferred = os.environ.get("SPACY_MODEL")
@@ -48,32 +92,37 @@ def get_spacy_nlp():
                         "en_core_web_sm",
                     ]
                     last_err = None
+                    nlp = None
                     for name in candidates:
                         if not name:
                             continue
                         try:
-                            _nlp = spacy.load(name)
+                            nlp = spacy.load(name)
+                            # Only NER is used from this pipeline; skip the rest per call
+                            for pipe in _SPACY_UNUSED_PIPES:
+                                if pipe in nlp.pipe_names:
+                                    nlp.disable_pipe(pipe)
                             break
                         except Exception as inner:
                             last_err = inner
-                            _nlp = None
-                    if _nlp is None:
+                            nlp = None
+                    if nlp is None:
                         raise RuntimeError(
                             f"No compatible spaCy model found. Tried: {candidates}. "
                             "Install models with: `python -m spacy download en_core_web_lg`, "
                             "`python -m spacy download en_core_web_md`, `python -m spacy download en_core_web_sm`. "
                             f"Last error: {last_err}"
                         )
+                    _swap(nlp=nlp)
                 except Exception as e:
                     raise HTTPException(status_code=500, detail=f"Failed to load spaCy model: {e}")
-    return _nlp
+    return _state.nlp
 
 
 def _try_load_rasa():
-    global _rasa_loaded, _rasa_interpreter, _rasa_error
-    if _rasa_loaded:
-        return _rasa_interpreter
-    _rasa_loaded = True
+    if _state.rasa_loaded:
+        return _state.rasa_interpreter
+    _swap(rasa_loaded=True)
     try:
         import importlib
         try:
@@ -81,27 +130,29 @@ def _try_load_rasa():
             from rasa.nlu.model import Interpreter  # type: ignore
             model_dir = Path("models") / "rasa"
             if not model_dir.exists():
-                _rasa_error = "Rasa model directory models/rasa not found."
+                _swap(rasa_error="Rasa model directory models/rasa not found.")
                 return None
             # Try to load the directory directly; Rasa will resolve latest model inside
-            _rasa_interpreter = Interpreter.load(str(model_dir))
-            return _rasa_interpreter
+            interpreter = Interpreter.load(str(model_dir))
+            _swap(rasa_interpreter=interpreter)
+            return interpreter
         except Exception as e1:
             # Older API fallback (Rasa < 1.0)
             try:
                 from rasa_nlu.model import Interpreter  # type: ignore
                 model_dir = Path("models") / "rasa"
-                _rasa_interpreter = Interpreter.load(str(model_dir))
-                return _rasa_interpreter
+                interpreter = Interpreter.load(str(model_dir))
+                _swap(rasa_interpreter=interpreter)
+                return interpreter
             except Exception as e2:
-                _rasa_error = (
+                _swap(rasa_error=(
                     "Rasa import failed in current environment. Either run a Rasa NLU server "
                     "and set RASA_SERVER_URL, or install Rasa in this runtime. "
                     f"Errors: rasa: {e1}; rasa_nlu: {e2}"
-                )
+                ))
                 return None
     except Exception as e:
-        _rasa_error = f"Rasa load failed: {e}"
+        _swap(rasa_error=f"Rasa load failed: {e}")
         return None
 
 
@@ -110,7 +161,6 @@ def _rasa_parse_via_server(text: str) -> Optional[Dict[str, Any]]:
 
     Returns the raw parse dict, or None if server URL not configured or request fails.
     """
-    global _rasa_error
     server_url = os.environ.get("RASA_SERVER_URL", "").strip()
     if not server_url:
         return None
@@ -121,18 +171,18 @@ def _rasa_parse_via_server(text: str) -> Optional[Dict[str, Any]]:
     if not url.endswith("/model/parse"):
         url = url + "/model/parse"
     try:
-        import json as _json
-        from urllib import request as _ureq
-        data = _json.dumps({"text": text}).encode("utf-8")
-        req = _ureq.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
-        with _ureq.urlopen(req, timeout=10) as resp:
-            if resp.status != 200:
-                _rasa_error = f"Rasa server HTTP {resp.status}"
-                return None
-            body = resp.read().decode("utf-8")
-            return json.loads(body)
+        resp = _rasa_session.post(
+            url,
+            data=orjson.dumps({"text": text}),
+            headers={"Content-Type": "application/json"},
+            timeout=_RASA_TIMEOUT,
+        )
+        if resp.status_code != 200:
+            _swap(rasa_error=f"Rasa server HTTP {resp.status_code}")
+            return None
+        return orjson.loads(resp.content)
     except Exception as e:
-        _rasa_error = f"Rasa server request failed: {e}"
+        _swap(rasa_error=f"Rasa server request failed: {e}")
         return None
 
 
@@ -154,20 +204,20 @@ def _tokens_to_features(sent: str, tokens: List[str], i: int) -> Dict[str, Any]:
 
 
 def _try_load_crf():
-    global _crf_loaded, _crf_model, _crf_error
-    if _crf_loaded:
-        return _crf_model
-    _crf_loaded = True
+    if _state.crf_loaded:
+        return _state.crf
+    _swap(crf_loaded=True)
     try:
         import joblib  # type: ignore
         model_path = Path("models") / "crf_ner" / "model.pkl"
         if not model_path.exists():
-            _crf_error = "CRF model not found at models/crf_ner/model.pkl."
+            _swap(crf_error="CRF model not found at models/crf_ner/model.pkl.")
             return None
-        _crf_model = joblib.load(model_path)
-        return _crf_model
+        crf = joblib.load(model_path)
+        _swap(crf=crf)
+        return crf
     except Exception as e:
-        _crf_error = f"CRF load failed: {e}"
+        _swap(crf_error=f"CRF load failed: {e}")
         return None
 
 def _spacy_entities(text: str) -> List[Dict[str, Any]]:
@@ -250,7 +300,9 @@ def _train_text_classifier(texts: List[str], labels: List[str]):
             return [[1.0] for _ in items]
 
     if len(unique_labels) == 1:
-        return _MajorityClassifier(unique_labels[0]), unique_labels
+        model = _MajorityClassifier(unique_labels[0])
+        _cache_classes(model)
+        return model, unique_labels
 
     # Rasa-lite: use a different representation than NERT-lite so
     # its behavior is more distinct. Here we keep LogisticRegression
@@ -285,10 +337,25 @@ def _train_text_classifier(texts: List[str], labels: List[str]):
     if not classes:
         classes = unique_labels
 
+    _cache_classes(pipeline)
     return pipeline, classes
 
 
+def _cache_classes(model) -> None:
+    """Store the string class list and a class->index map on a fitted model.
+
+    Prediction then reads them back as plain attributes instead of walking
+    ``named_steps`` and scanning the class list on every request.
+    """
+    classes = _extract_classes(model)
+    model._nlu_classes = classes
+    model._nlu_class_to_idx = {c: i for i, c in enumerate(classes)}
+
+
 def _extract_classes(model) -> List[str]:
+    cached = getattr(model, "_nlu_classes", None)
+    if cached is not None:
+        return cached
     classes = list(getattr(model, "classes_", []))
     if classes:
         return [str(c) for c in classes]
@@ -307,11 +374,11 @@ def _predict_with_confidence(model, text: str, default_confidence: float = 0.88)
         probabilities = model.predict_proba([text])[0]
         classes = _extract_classes(model)
         if classes and len(probabilities) == len(classes):
-            try:
-                idx = list(classes).index(intent_str)
-                confidence = float(probabilities[idx])
-            except ValueError:
-                confidence = default_confidence
+            class_to_idx = getattr(model, "_nlu_class_to_idx", None)
+            if class_to_idx is None:
+                class_to_idx = {c: i for i, c in enumerate(classes)}
+            idx = class_to_idx.get(intent_str)
+            confidence = float(probabilities[idx]) if idx is not None else default_confidence
         elif len(probabilities) == 1:
             confidence = float(probabilities[0])
     except Exception:
@@ -409,23 +476,92 @@ def _bio_to_spans(tokens: List[str], labels: List[str], text: str) -> List[Dict[
     return spans
 
 
+def _textcat_winner(doc_scores, label_data) -> Optional[Tuple[str, float]]:
+    """Pick the highest-scoring (label, score) from one row of textcat output."""
+    if isinstance(doc_scores, dict):
+        return max(doc_scores.items(), key=lambda kv: kv[1]) if doc_scores else None
+    probs = np.asarray(doc_scores)
+    if label_data and len(label_data) == len(probs):
+        max_idx = int(probs.argmax())
+        return (label_data[max_idx], float(probs[max_idx]))
+    return None
+
+
+def _batch_predict_spacy_intents(texts: List[str], batch_size: int = 32) -> Optional[List[Optional[Tuple[str, float]]]]:
+    """Score many texts with the trained spaCy textcat in minibatches.
+
+    Tokenizes with ``nlp.tokenizer.pipe`` and calls ``textcat.predict`` once per
+    batch instead of once per text. Returns None when no textcat is trained;
+    otherwise one winner (or None if undecidable) per input text, in order.
+    """
+    textcat, textcat_nlp = _state.textcat
+    if textcat is None or textcat_nlp is None:
+        return None
+    label_data = textcat.labels  # type: ignore[attr-defined]
+    winners: List[Optional[Tuple[str, float]]] = []
+    docs = textcat_nlp.tokenizer.pipe(texts, batch_size=batch_size)
+    for batch in minibatch(docs, size=batch_size):
+        scores = textcat.predict(list(batch))  # type: ignore
+        if isinstance(scores, np.ndarray) and scores.ndim == 2 and label_data and scores.shape[1] == len(label_data):
+            # One argmax over the whole batch instead of one per row
+            best = scores.argmax(axis=1)
+            for row, idx in enumerate(best.tolist()):
+                winners.append((label_data[idx], float(scores[row, idx])))
+            continue
+        for doc_scores in scores:
+            winners.append(_textcat_winner(doc_scores, label_data))
+    return winners
+
+
+@lru_cache(maxsize=4096)
+def _cached_intent(engine: str, text: str, generation: int) -> Tuple[str, float]:
+    if engine in ("rasa", "nert"):
+        model, _ = _state.rasa_intent if engine == "rasa" else _state.nert_intent
+        if model is None:
+            raise LookupError(f"{engine} intent model not trained")
+        classes = _extract_classes(model)
+        default_conf = (0.95 if engine == "rasa" else 0.9) if len(classes) > 1 else 1.0
+        return _predict_with_confidence(model, text, default_conf)
+
+    textcat, textcat_nlp = _state.textcat
+    if textcat is None or textcat_nlp is None:
+        raise LookupError("spaCy textcat model not trained")
+    doc = textcat_nlp.make_doc(text)
+    scores = textcat.predict([doc])  # type: ignore
+    if scores is None or len(scores) == 0:
+        raise HTTPException(status_code=500, detail="spaCy intent model returned no scores")
+    winner = _textcat_winner(scores[0], textcat.labels)  # type: ignore[attr-defined]
+    if winner is None:
+        raise HTTPException(status_code=500, detail="Unable to determine intent from spaCy textcat scores")
+    return winner[0], float(winner[1])
+
+
+def _score_intent(engine: str, text: str) -> Tuple[str, float]:
+    """Intent and confidence from the in-process model trained for ``engine``.
+
+    Results are memoized per (engine, text) until that model is retrained.
+    The sklearn vectorizers behind rasa/nert lowercase their input, so those
+    keys are lowercased too; spaCy textcat features are case-sensitive.
+    """
+    text = text.strip()
+    if engine in ("rasa", "nert"):
+        text = text.lower()
+    return _cached_intent(engine, text, _state.generation)
+
+
 @router.post("/train/intent/spacy", status_code=status.HTTP_200_OK)
 def train_spacy_intent(payload: TrainSpacyIntentPayload, authorization: AuthorizationHeader = None):
     """Quickly train a spaCy textcat model in-memory for evaluation.
 
     This avoids heavyweight dependencies and matches the dataset the user loaded.
     """
-    # Clear only spaCy model to allow retraining - preserve other models
-    global _spacy_textcat, _spacy_textcat_nlp
-    
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     token = authorization.replace("Bearer ", "")
-    decode_token(token)
+    cached_decode_token(token)
 
     # Only clear spaCy model, don't touch Rasa or NERT
-    _spacy_textcat = None
-    _spacy_textcat_nlp = None
+    _swap(textcat=(None, None))
 
     if not payload.texts or not payload.labels or len(payload.texts) != len(payload.labels):
         raise HTTPException(status_code=400, detail="texts and labels must be same length and non-empty")
@@ -459,8 +595,7 @@ def train_spacy_intent(payload: TrainSpacyIntentPayload, authorization: Authoriz
                 nlp.update(exs, sgd=optimizer, losses=losses)
 
         # Expose trained components globally for prediction
-        _spacy_textcat = nlp.get_pipe("textcat")
-        _spacy_textcat_nlp = nlp
+        _swap(textcat=(nlp.get_pipe("textcat"), nlp))
         
         # Log training completion
         print(f"✅ spaCy model trained: {len(examples)} samples, {len(labels)} labels, {epochs} epochs")
@@ -477,25 +612,20 @@ def train_spacy_intent(payload: TrainSpacyIntentPayload, authorization: Authoriz
 
 @router.post("/train/intent/rasa-lite", status_code=status.HTTP_200_OK)
 def train_rasa_intent(payload: TrainClassicIntentPayload, authorization: AuthorizationHeader = None):
-    # Clear only Rasa model to allow retraining - preserve other models
-    global _rasa_intent_model, _rasa_intent_labels
-    
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     token = authorization.replace("Bearer ", "")
-    decode_token(token)
+    cached_decode_token(token)
 
     # Only clear Rasa model, don't touch spaCy or NERT
-    _rasa_intent_model = None
-    _rasa_intent_labels = None
+    _swap(rasa_intent=(None, None))
 
     if not payload.texts or not payload.labels or len(payload.texts) != len(payload.labels):
         raise HTTPException(status_code=400, detail="texts and labels must be same length and non-empty")
 
     try:
         model, classes = _train_text_classifier(payload.texts, payload.labels)
-        _rasa_intent_model = model
-        _rasa_intent_labels = classes
+        _swap(rasa_intent=(model, classes))
         
         # Log training completion
         print(f"✅ Rasa model trained: {len(payload.texts)} samples, {len(classes)} labels")
@@ -511,18 +641,13 @@ def train_rasa_intent(payload: TrainClassicIntentPayload, authorization: Authori
 
 @router.post("/train/ner/nert-lite", status_code=status.HTTP_200_OK)
 def train_nert(payload: TrainNertPayload, authorization: AuthorizationHeader = None):
-    # Clear only NERT model and CRF to allow retraining - preserve other models
-    global _nert_intent_model, _nert_intent_labels, _crf_model, _crf_loaded
-    
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     token = authorization.replace("Bearer ", "")
-    decode_token(token)
+    cached_decode_token(token)
 
     # Only clear NERT and CRF models, don't touch spaCy or Rasa
-    _nert_intent_model = None
-    _nert_intent_labels = None
-    _crf_model = None
+    _swap(nert_intent=(None, None), crf=None)
 
     if not payload.records:
         raise HTTPException(status_code=400, detail="records must be non-empty")
@@ -570,9 +695,9 @@ def train_nert(payload: TrainNertPayload, authorization: AuthorizationHeader = N
             ])
             intent_model.fit(processed_texts, processed_labels)
             classes = list(getattr(intent_model, "classes_", [])) or unique_labels
+        _cache_classes(intent_model)
 
-        _nert_intent_model = intent_model
-        _nert_intent_labels = classes
+        _swap(nert_intent=(intent_model, classes))
 
         # Train CRF entities when annotations available
         crf_model = None
@@ -581,18 +706,16 @@ def train_nert(payload: TrainNertPayload, authorization: AuthorizationHeader = N
             try:
                 from sklearn_crfsuite import CRF  # type: ignore
 
-                X_train: List[List[Dict[str, Any]]] = []
-                y_train: List[List[str]] = []
-                has_labeled_tokens = False
+                # Tokens and BIO tags are cheap, so build them up front to decide
+                # whether there is anything to learn before fitting
+                tagged = []
                 for rec in payload.records:
-                    tokens = _tokenize_for_crf(rec.text or "")
-                    feats = [_tokens_to_features(rec.text or "", tokens, i) for i in range(len(tokens))]
-                    spans = _spans_to_bio_tags(tokens, [ent.dict() for ent in rec.entities], rec.text or "")
-                    if any(tag != "O" for tag in spans):
-                        has_labeled_tokens = True
-                    X_train.append(feats)
-                    y_train.append(spans)
-                if has_labeled_tokens and X_train:
+                    text = rec.text or ""
+                    tokens = _tokenize_for_crf(text)
+                    tagged.append((text, tokens, _spans_to_bio_tags(tokens, [ent.dict() for ent in rec.entities], text)))
+                has_labeled_tokens = any(tag != "O" for _, _, tags in tagged for tag in tags)
+
+                if has_labeled_tokens:
                     crf_model = CRF(
                         algorithm="lbfgs",
                         c1=0.1,
@@ -600,13 +723,17 @@ def train_nert(payload: TrainNertPayload, authorization: AuthorizationHeader = N
                         max_iterations=100,
                         all_possible_transitions=True,
                     )
-                    crf_model.fit(X_train, y_train)
+                    # CRF.fit only zips X with y and appends each pair to CRFsuite, so the
+                    # per-token feature dicts are streamed one record at a time
+                    crf_model.fit(
+                        ([_tokens_to_features(text, tokens, i) for i in range(len(tokens))] for text, tokens, _ in tagged),
+                        [tags for _, _, tags in tagged],
+                    )
             except Exception:
                 crf_model = None
 
         if crf_model is not None:
-            _crf_model = crf_model
-            _crf_loaded = True
+            _swap(crf=crf_model, crf_loaded=True)
 
         # Log training completion
         print(f"✅ NERT model trained: {len(texts)} samples, {len(classes)} labels, CRF: {bool(crf_model)}")
@@ -639,7 +766,7 @@ def predict(payload: PredictPayload, authorization: AuthorizationHeader = None):
 
     # Validate token (even if result is unused, it enforces auth)
     token = authorization.replace("Bearer ", "")
-    decode_token(token)
+    cached_decode_token(token)
 
     text = (payload.text or "").strip()
     if not text:
@@ -648,15 +775,14 @@ def predict(payload: PredictPayload, authorization: AuthorizationHeader = None):
     engine = (payload.model_id or "spacy").lower()
     try:
         if engine == "rasa":
-            if _rasa_intent_model is not None:
+            rasa_model, _ = _state.rasa_intent
+            if rasa_model is not None:
                 # Use trained intent classifier
-                classes = _extract_classes(_rasa_intent_model)
-                default_conf = 0.95 if len(classes) > 1 else 1.0
-                intent, confidence = _predict_with_confidence(_rasa_intent_model, text, default_conf)
+                intent, confidence = _score_intent("rasa", text)
                 
                 # Extract entities using CRF if available, otherwise use rules only
                 entities: List[Dict[str, Any]] = []
-                crf = _crf_model if _crf_model is not None else _try_load_crf()
+                crf = _state.crf if _state.crf is not None else _try_load_crf()
                 if crf:
                     try:
                         tokens = _tokenize_for_crf(text)
@@ -676,7 +802,7 @@ def predict(payload: PredictPayload, authorization: AuthorizationHeader = None):
                         pass
                 
                 # Enrich with rule-based entities
-                supplemental = _extract_travel_entities(text) + _extract_food_entities(text) + _extract_health_entities(text)
+                supplemental = extract_entities(text)
                 entities = _deduplicate_entities(text, entities + supplemental)
                 return {"intent": intent, "confidence": confidence, "entities": entities}
 
@@ -708,19 +834,18 @@ def predict(payload: PredictPayload, authorization: AuthorizationHeader = None):
             return {"intent": intent, "confidence": confidence, "entities": entities}
 
         if engine == "nert":
-            if _nert_intent_model is None:
+            nert_model, _ = _state.nert_intent
+            if nert_model is None:
                 raise HTTPException(
                     status_code=503,
                     detail="NERT intent model not trained. Call /train/ner/nert-lite before predicting.",
                 )
 
-            classes = _extract_classes(_nert_intent_model)
-            default_conf = 0.9 if len(classes) > 1 else 1.0
-            intent, confidence = _predict_with_confidence(_nert_intent_model, text, default_conf)
+            intent, confidence = _score_intent("nert", text)
 
             # Extract entities using CRF if available
             entities: List[Dict[str, Any]] = []
-            crf = _crf_model if _crf_model is not None else _try_load_crf()
+            crf = _state.crf if _state.crf is not None else _try_load_crf()
             if crf:
                 try:
                     tokens = _tokenize_for_crf(text)
@@ -742,7 +867,7 @@ def predict(payload: PredictPayload, authorization: AuthorizationHeader = None):
                     pass
 
             # Always enrich with rule-based entities (even if CRF failed or not available)
-            supplemental = _extract_travel_entities(text) + _extract_food_entities(text) + _extract_health_entities(text)
+            supplemental = extract_entities(text)
             entities = _deduplicate_entities(text, entities + supplemental)
             return {"intent": intent, "confidence": confidence, "entities": entities}
 
@@ -755,7 +880,8 @@ def predict(payload: PredictPayload, authorization: AuthorizationHeader = None):
             )
 
         # Default: spaCy engine
-        if _spacy_textcat is None or _spacy_textcat_nlp is None:
+        textcat, textcat_nlp = _state.textcat
+        if textcat is None or textcat_nlp is None:
             raise HTTPException(
                 status_code=503,
                 detail="spaCy textcat model not trained. Call /train/intent/spacy before predicting.",
@@ -770,24 +896,8 @@ def predict(payload: PredictPayload, authorization: AuthorizationHeader = None):
                 continue
             entities.append(e)
         # Enrich with rules
-        entities = _deduplicate_entities(text, entities + _extract_travel_entities(text) + _extract_food_entities(text) + _extract_health_entities(text))
-        doc = _spacy_textcat_nlp.make_doc(text)
-        scores = _spacy_textcat.predict([doc])  # type: ignore
-        if scores is None or len(scores) == 0:
-            raise HTTPException(status_code=500, detail="spaCy intent model returned no scores")
-        doc_scores = scores[0]
-        label_data = _spacy_textcat.labels  # type: ignore[attr-defined]
-        winner: Optional[Tuple[str, float]] = None
-        if isinstance(doc_scores, dict):
-            winner = max(doc_scores.items(), key=lambda kv: kv[1]) if doc_scores else None
-        else:
-            probs = list(doc_scores)
-            if label_data and len(label_data) == len(probs):
-                max_idx = int(probs.index(max(probs)))
-                winner = (label_data[max_idx], float(probs[max_idx]))
-        if winner is None:
-            raise HTTPException(status_code=500, detail="Unable to determine intent from spaCy textcat scores")
-        intent, confidence = winner[0], float(winner[1])
+        entities = _deduplicate_entities(text, entities + extract_entities(text))
+        intent, confidence = _score_intent("spacy", text)
         return {"intent": intent, "confidence": confidence, "entities": entities}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
@@ -818,7 +928,7 @@ def predict_batch(payload: BatchPredictPayload, authorization: AuthorizationHead
 
     # Validate token
     token = authorization.replace("Bearer ", "")
-    decode_token(token)
+    cached_decode_token(token)
 
     if not payload.texts or len(payload.texts) == 0:
         raise HTTPException(status_code=400, detail="At least one text is required")
@@ -827,13 +937,39 @@ def predict_batch(payload: BatchPredictPayload, authorization: AuthorizationHead
         engine = (payload.model_id or "spacy").lower()
         _ = bool(payload.strict)  # reserved for future use; predictions are always raw
 
+        texts = [(text or "").strip() for text in payload.texts]
+        # spaCy: score each distinct non-empty text once in a batched pass;
+        # duplicates and empty inputs are resolved per index below.
+        spacy_winners: Dict[str, Optional[Tuple[str, float]]] = {}
+        if engine not in {"rasa", "nert", "intent", "hf", "transformer"}:
+            unique = list(dict.fromkeys(t for t in texts if t))
+            winners = _batch_predict_spacy_intents(unique) if unique else None
+            if winners is not None:
+                spacy_winners = dict(zip(unique, winners))
+        # rasa/nert: intent only, so skip the entity work done by predict()
+        trained_model = None
+        if engine == "rasa":
+            trained_model = _state.rasa_intent[0]
+        elif engine == "nert":
+            trained_model = _state.nert_intent[0]
+
         results = []
-        for text in payload.texts:
-            t = (text or "").strip()
+        for t in texts:
             if not t:
                 results.append({"text": t, "intent": "unknown", "confidence": 0.0})
                 continue
+            if t in spacy_winners:
+                winner = spacy_winners[t]
+                if winner is None:
+                    results.append({"text": t, "intent": "error", "confidence": 0.0, "error": "Unable to determine intent from spaCy textcat scores"})
+                else:
+                    results.append({"text": t, "intent": str(winner[0]).strip().lower(), "confidence": float(winner[1])})
+                continue
             try:
+                if trained_model is not None:
+                    intent, confidence = _score_intent(engine, t)
+                    results.append({"text": t, "intent": intent.strip().lower(), "confidence": float(confidence)})
+                    continue
                 single = predict(PredictPayload(text=t, model_id=engine), authorization)
                 raw_intent = str(single.get("intent", "unknown")).strip().lower()
                 results.append({"text": t, "intent": raw_intent, "confidence": float(single.get("confidence", 0.0))})
@@ -845,239 +981,339 @@ def predict_batch(payload: BatchPredictPayload, authorization: AuthorizationHead
         raise HTTPException(status_code=500, detail=f"Batch prediction failed: {e}")
 
 
-def _extract_food_entities(text: str) -> List[Dict[str, Any]]:
+# Food items and beverages vocabulary (extend as needed)
+_FOOD_VOCAB = {
+    "food_item": [
+        "pizza", "pepperoni pizza", "margherita", "burger", "veg burger", "chicken burger",
+        "sandwich", "club sandwich", "fries", "biryani", "veg biryani", "chicken biryani",
+        "noodles", "fried rice", "pasta", "taco", "wrap", "salad", "idli", "dosa", "paratha",
+        "paneer", "butter chicken", "paneer tikka"
+    ],
+    "beverage": [
+        "coffee", "tea", "coke", "pepsi", "sprite", "fanta", "juice", "lassi", "milkshake"
+    ],
+}
+
+# Quantity patterns: "2", "2x", "x2" (these can overlap, so they stay separate scans)
+_QTY_RES = (
+    re.compile(r"(\d+)\s*(?:x|pcs|pieces|orders|plates)?"),
+    re.compile(r"x\s*(\d+)"),
+)
+# Quantity words and sizes, in the order the food extractor reports them
+_FOOD_QUANTITY_WORDS = ("one", "two", "three", "four", "five", "single", "double", "triple")
+_FOOD_SIZES = ("small", "medium", "large", "regular", "jumbo", "family")
+
+# Healthcare vocabulary, in the order the extractor reports matches
+_HEALTH_VOCAB = {
+    "symptom": [
+        "fever", "cough", "cold", "flu", "headache", "migraine", "sore throat", "throat pain",
+        "chest pain", "stomach ache", "abdominal pain", "back pain", "vomiting", "diarrhea", "dizziness",
+        "fatigue", "rash"
+    ],
+    "body_part": ["head", "chest", "stomach", "abdomen", "back", "leg", "arm", "eye", "ear", "nose", "throat", "knee", "shoulder"],
+    # Longer medication/test names first
+    "medication": sorted([
+        "paracetamol", "acetaminophen", "ibuprofen", "amoxicillin", "azithromycin", "metformin", "insulin",
+        "aspirin", "omeprazole", "pantoprazole", "dolo 650", "crocin", "ciprofloxacin"
+    ], key=len, reverse=True),
+    "test_name": sorted([
+        "blood test", "cbc", "liver function test", "lft", "kidney function test", "kft", "x-ray", "ct scan", "mri",
+        "ultrasound", "thyroid test", "tsh", "sugar test", "hba1c", "ecg"
+    ], key=len, reverse=True),
+    # 'ent' must be a standalone word to avoid matching 'appointment'
+    "specialty": [
+        "dermatology", "dermatologist", "cardiology", "cardiologist", "orthopedic", "orthopedics", "ent",
+        "gynecology", "gynecologist", "pediatrics", "pediatrician", "neurologist", "neurology"
+    ],
+}
+
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+
+def _build_vocab_automaton(*sources: Tuple[str, Dict[str, List[str]], bool]):
+    """Build one Aho-Corasick automaton over every phrase of every ``(domain, vocab, sort_by_length)`` source.
+
+    Each key maps to a tuple of ``(domain, rank, phrase, label)`` payloads.
+    ``rank`` is the position the phrase had in its domain's old per-word scan,
+    so callers can emit matches in the same order the word-by-word loops did.
+    """
+    automaton = ahocorasick.Automaton()
+    payloads: Dict[str, List[Tuple[str, int, str, str]]] = {}
+    for domain, vocab, sort_by_length in sources:
+        rank = 0
+        for label, words in vocab.items():
+            ordered = sorted(words, key=len, reverse=True) if sort_by_length else words
+            for word in ordered:
+                phrase = word.lower()
+                payloads.setdefault(phrase, []).append((domain, rank, phrase, label))
+                rank += 1
+    for phrase, entries in payloads.items():
+        automaton.add_word(phrase, tuple(entries))
+    automaton.make_automaton()
+    return automaton
+
+
+# Built once at import; a single pass over the text finds every food and health phrase
+_VOCAB_AC = _build_vocab_automaton(("food", _FOOD_VOCAB, True), ("health", _HEALTH_VOCAB, False))
+
+# Every health rule needs one of these in the lowercased text: a vocab phrase
+# prefix, a once/twice/thrice frequency, "dr" for doctor names, or a digit for
+# dosage/duration/"every N" patterns.
+_HEALTH_TRIGGERS = frozenset(
+    {phrase[:3] for phrases in _HEALTH_VOCAB.values() for phrase in phrases} | {"onc", "twi", "thr", "dr"}
+)
+_DIGIT_RE = re.compile(r"\d")
+
+
+def _health_likely(tl: str) -> bool:
+    """Quick reject for texts no health rule can match (never a false negative)."""
+    return any(tri in tl for tri in _HEALTH_TRIGGERS) or _DIGIT_RE.search(tl) is not None
+
+# Pattern families whose matches can never overlap, merged into one alternation
+# per family so each is a single scan of the text. Each branch is a named
+# group; _ordered_matches restores the per-pattern emission order.
+_DOSAGE_RE = re.compile(
+    r"\b(?:(?P<amount>\d+\s*(?:mg|ml|mcg|g))"
+    r"|(?P<count>\d+\s*(?:tablet|tablets|capsule|capsules|puff|puffs|spoon|spoons)))\b"
+)
+_DOSAGE_SCORES = {"amount": 0.95, "count": 0.92}
+_FREQ_DURATION_RE = re.compile(
+    r"\b(?:(?P<times>(?:once|twice|thrice) (?:a |per )?(?:day|daily|week|month))"
+    r"|(?P<interval>every \d+ (?:hours|hour|days|day|weeks|week))"
+    r"|(?P<duration>for \d+ (?:days|day|weeks|week|months|month)))\b"
+)
+_FREQ_DURATION_LABELS = {"times": "frequency", "interval": "frequency", "duration": "duration"}
+_DR_NAME_RE = re.compile(r"\bdr\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b")
+# Strict patterns for AC classes to avoid matching inside words like "package"
+_AC_CLASS_RE = re.compile(r"\b(?:(?P<c3a>3a)|(?P<c2a>2a)|(?P<c1a>1a)|(?P<ac>ac))\b")
+
+
+def _ordered_matches(pattern: "re.Pattern[str]", text: str) -> List["re.Match[str]"]:
+    """Matches of a named-group alternation, grouped by branch then position."""
+    order = pattern.groupindex
+    return sorted(pattern.finditer(text), key=lambda m: (order[m.lastgroup], m.start()))
+
+
+def _scan_vocab(tl: str) -> Tuple[List[Tuple[int, int, str]], List[Tuple[int, int, str]]]:
+    """One automaton pass returning ``(start, end, label)`` food and health vocab hits.
+
+    Food keeps the first occurrence of each phrase; health keeps every
+    occurrence with alphabetic boundaries on both sides. Both come back in the
+    order the per-domain extractors emit them.
+    """
+    food_first: Dict[int, Tuple[int, int, str]] = {}
+    health_hits: List[Tuple[int, int, int, str]] = []
+    n = len(tl)
+    for end, entries in _VOCAB_AC.iter(tl):
+        e = end + 1
+        # Health vocab words need strict alphabetic boundaries to avoid
+        # substring hits (e.g., 'ent' inside 'appointment').
+        right_ok = e >= n or tl[e] not in _ASCII_LETTERS
+        for domain, rank, phrase, label in entries:
+            s = e - len(phrase)
+            if domain == "food":
+                if rank not in food_first:
+                    food_first[rank] = (s, e, label)
+            elif right_ok and (s == 0 or tl[s - 1] not in _ASCII_LETTERS):
+                health_hits.append((rank, s, e, label))
+    health_hits.sort()
+    food = [food_first[rank] for rank in sorted(food_first)]
+    return food, [(s, e, label) for _, s, e, label in health_hits]
+
+
+def _extract_food(t: str, tl: str, vocab_hits: List[Tuple[int, int, str]]) -> List[Dict[str, Any]]:
     """Lightweight rule-based extraction for common food attributes.
     Produces entities with labels: food_item, quantity, size, beverage.
     """
-    import re
-
-    t = text or ""
-    tl = t.lower()
     entities: List[Dict[str, Any]] = []
 
-    # Food items and beverages vocabulary (extend as needed)
-    vocab = {
-        "food_item": [
-            "pizza", "pepperoni pizza", "margherita", "burger", "veg burger", "chicken burger",
-            "sandwich", "club sandwich", "fries", "biryani", "veg biryani", "chicken biryani",
-            "noodles", "fried rice", "pasta", "taco", "wrap", "salad", "idli", "dosa", "paratha",
-            "paneer", "butter chicken", "paneer tikka"
-        ],
-        "beverage": [
-            "coffee", "tea", "coke", "pepsi", "sprite", "fanta", "juice", "lassi", "milkshake"
-        ],
-    }
-
-    def add_span(text_sub: str, label: str, score: float = 0.99):
-        start = tl.find(text_sub.lower())
+    def add_span(sub_lower: str, label: str, score: float = 0.99):
+        # sub_lower comes from the lowercase module-level word tuples
+        start = tl.find(sub_lower)
         if start != -1:
-            end = start + len(text_sub)
+            end = start + len(sub_lower)
             entities.append({"text": t[start:end], "label": label, "score": score, "start": start, "end": end})
 
-    # Items
-    for label, words in vocab.items():
-        for w in sorted(words, key=len, reverse=True):  # prefer longer phrases first
-            add_span(w, label)
+    # Items: first occurrence of each phrase
+    for start, end, label in vocab_hits:
+        entities.append({"text": t[start:end], "label": label, "score": 0.99, "start": start, "end": end})
 
     # Quantity patterns: "2", "2x", "x2", "two", "double"
-    qty_patterns = [
-        r"(\d+)\s*(?:x|pcs|pieces|orders|plates)?",
-        r"x\s*(\d+)",
-    ]
-    word_numbers = {
-        "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-        "single": 1, "double": 2, "triple": 3
-    }
-    for pat in qty_patterns:
-        for m in re.finditer(pat, tl):
+    for pat in _QTY_RES:
+        for m in pat.finditer(tl):
             s, e = m.span()
             entities.append({"text": t[s:e], "label": "quantity", "score": 0.9, "start": s, "end": e})
-    for w, n in word_numbers.items():
-        if w in tl:
-            add_span(w, "quantity", 0.9)
+    for w in _FOOD_QUANTITY_WORDS:
+        add_span(w, "quantity", 0.9)
 
     # Size patterns
-    for size in ["small", "medium", "large", "regular", "jumbo", "family"]:
-        if size in tl:
-            add_span(size, "size", 0.95)
+    for size in _FOOD_SIZES:
+        add_span(size, "size", 0.95)
 
     return entities
 
 
-def _extract_health_entities(text: str) -> List[Dict[str, Any]]:
+def _extract_health(t: str, tl: str, vocab_hits: List[Tuple[int, int, str]]) -> List[Dict[str, Any]]:
     """Rule-based extraction for common healthcare attributes.
     Labels: symptom, body_part, medication, dosage, frequency, duration, test_name, specialty, doctor_name.
     """
-    import re
-
-    t = text or ""
-    tl = t.lower()
     entities: List[Dict[str, Any]] = []
-
-    def add_span(sub: str, label: str, score: float = 0.98):
-        i = tl.find(sub.lower())
-        if i != -1:
-            entities.append({"text": t[i:i+len(sub)], "label": label, "score": score, "start": i, "end": i+len(sub)})
-
-    def add_span_word(word: str, label: str, score: float = 0.98):
-        """Match a 'word' with strict alphabetic boundaries to avoid substring hits
-        (e.g., 'ent' inside 'appointment').
-        """
-        pat = rf"(?<![A-Za-z]){re.escape(word)}(?![A-Za-z])"
-        for m in re.finditer(pat, tl):
-            s, e = m.span()
-            entities.append({"text": t[s:e], "label": label, "score": score, "start": s, "end": e})
-
-    # Vocab lists
-    symptoms = [
-        "fever", "cough", "cold", "flu", "headache", "migraine", "sore throat", "throat pain",
-        "chest pain", "stomach ache", "abdominal pain", "back pain", "vomiting", "diarrhea", "dizziness",
-        "fatigue", "rash"
-    ]
-    body_parts = ["head", "chest", "stomach", "abdomen", "back", "leg", "arm", "eye", "ear", "nose", "throat", "knee", "shoulder"]
-    medications = [
-        "paracetamol", "acetaminophen", "ibuprofen", "amoxicillin", "azithromycin", "metformin", "insulin",
-        "aspirin", "omeprazole", "pantoprazole", "dolo 650", "crocin", "ciprofloxacin"
-    ]
-    tests = [
-        "blood test", "cbc", "liver function test", "lft", "kidney function test", "kft", "x-ray", "ct scan", "mri",
-        "ultrasound", "thyroid test", "tsh", "sugar test", "hba1c", "ecg"
-    ]
-    specialties = [
-        "dermatology", "dermatologist", "cardiology", "cardiologist", "orthopedic", "orthopedics", "ent",
-        "gynecology", "gynecologist", "pediatrics", "pediatrician", "neurologist", "neurology"
-    ]
-
-    for s in symptoms:
-        add_span_word(s, "symptom")
-    for bp in body_parts:
-        add_span_word(bp, "body_part")
-    # Longer medication names first; still enforce word boundaries
-    for med in sorted(medications, key=len, reverse=True):
-        add_span_word(med, "medication")
-    for ts in sorted(tests, key=len, reverse=True):
-        add_span_word(ts, "test_name")
-    for sp in specialties:
-        # 'ent' must be a standalone word to avoid matching 'appointment'
-        if sp == "ent":
-            add_span_word(sp, "specialty")
-        else:
-            add_span_word(sp, "specialty")
+    for s, e, label in vocab_hits:
+        entities.append({"text": t[s:e], "label": label, "score": 0.98, "start": s, "end": e})
+    if not _health_likely(tl):
+        return entities
 
     # Dosage: 500 mg, 5mg, 1 tablet, 2 tablets
-    for m in re.finditer(r"\b\d+\s*(?:mg|ml|mcg|g)\b", tl):
+    for m in _ordered_matches(_DOSAGE_RE, tl):
         s, e = m.span()
-        entities.append({"text": t[s:e], "label": "dosage", "score": 0.95, "start": s, "end": e})
-    for m in re.finditer(r"\b(\d+)\s*(?:tablet|tablets|capsule|capsules|puff|puffs|spoon|spoons)\b", tl):
-        s, e = m.span()
-        entities.append({"text": t[s:e], "label": "dosage", "score": 0.92, "start": s, "end": e})
-
-    # Frequency: twice daily, every 8 hours, once a day
-    freq_patterns = [
-        r"\b(?:once|twice|thrice) (?:a |per )?(?:day|daily|week|month)\b",
-        r"\bevery \d+ (?:hours|hour|days|day|weeks|week)\b",
-    ]
-    for pat in freq_patterns:
-        for m in re.finditer(pat, tl):
-            s, e = m.span()
-            entities.append({"text": t[s:e], "label": "frequency", "score": 0.9, "start": s, "end": e})
+        entities.append({"text": t[s:e], "label": "dosage", "score": _DOSAGE_SCORES[m.lastgroup], "start": s, "end": e})
 
-    # Duration: for 5 days, 3 weeks
-    for m in re.finditer(r"\bfor \d+ (?:days|day|weeks|week|months|month)\b", tl):
+    # Frequency: twice daily, every 8 hours, once a day; duration: for 5 days, 3 weeks
+    for m in _ordered_matches(_FREQ_DURATION_RE, tl):
         s, e = m.span()
-        entities.append({"text": t[s:e], "label": "duration", "score": 0.9, "start": s, "end": e})
+        entities.append({"text": t[s:e], "label": _FREQ_DURATION_LABELS[m.lastgroup], "score": 0.9, "start": s, "end": e})
 
     # Doctor Name: Dr. <Name>
-    for m in re.finditer(r"\bdr\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b", t):
+    for m in _DR_NAME_RE.finditer(t):
         s, e = m.span()
         entities.append({"text": t[s:e], "label": "doctor_name", "score": 0.93, "start": s, "end": e})
 
     return entities
 
 
-def _extract_travel_entities(text: str) -> List[Dict[str, Any]]:
+# Class/quota phrases only count when one of these travel keywords is present
+_TRAVEL_CONTEXT_KEYWORDS = (
+    "train", "railway", "bus", "coach", "flight", "plane", "airport", "station",
+    "pnr", "ticket", "tickets", "booking", "reservation", "seat", "berth", "sleeper",
+)
+_TRAVEL_CLASSES = ("economy", "business", "first class", "sleeper")
+_TRAVEL_QUOTAS = ("tatkal", "premium tatkal", "ladies quota", "senior citizen", "general quota", "general")
+
+_FROM_TO_RE = re.compile(r"\bfrom\s+([a-zA-Z ]{2,40})\s+to\s+([a-zA-Z ]{2,40})\b")
+_TO_CITY_RE = re.compile(r"\bto\s+([a-zA-Z ]{2,40})\b")
+# Supports: 12/11/2025, 12-11-2025, 12 Nov, Nov 12, tomorrow, today, next monday
+_DATE_RES = (
+    re.compile(r"\b\d{1,2}[\/-]\d{1,2}(?:[\/-]\d{2,4})?\b"),
+    re.compile(r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\s+\d{1,2}\b"),
+    re.compile(r"\b\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\b"),
+    re.compile(r"\b(?:today|tomorrow|day after tomorrow|next\s+(?:mon|tue|wed|thu|thur|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday))\b"),
+)
+# Time: 5 pm, 17:30 ("5:30 pm" matches both, so these stay separate scans)
+_TIME_RES = (re.compile(r"\b\d{1,2}:\d{2}\b"), re.compile(r"\b\d{1,2}\s*(?:am|pm)\b"))
+_NON_AC_RE = re.compile(r"\bnon[ -]?ac\b")
+_PAX_RE = re.compile(r"\b(\d+)\s*(?:passengers|passenger|people|persons|adults|kids|children)\b")
+
+
+def _extract_travel(t: str, tl: str) -> List[Dict[str, Any]]:
     """Rule-based extraction for common travel attributes.
     Labels: source, destination, date, time, class, passenger_count, quota.
     """
-    import re
-
-    t = text or ""
-    tl = t.lower()
     ents: List[Dict[str, Any]] = []
 
-    def add_span(sub: str, label: str, score: float = 0.96):
-        i = tl.find(sub.lower())
+    def add_span(sub_lower: str, label: str, score: float = 0.96):
+        # sub_lower comes from the lowercase module-level word tuples
+        i = tl.find(sub_lower)
         if i != -1:
-            ents.append({"text": t[i:i+len(sub)], "label": label, "score": score, "start": i, "end": i+len(sub)})
+            ents.append({"text": t[i:i+len(sub_lower)], "label": label, "score": score, "start": i, "end": i+len(sub_lower)})
 
-    def add_span_regex(pattern: str, label: str, score: float = 0.96):
-        for m in re.finditer(pattern, tl):
+    def add_span_regex(pattern: "re.Pattern[str]", label: str, score: float = 0.96):
+        for m in pattern.finditer(tl):
             s, e = m.span()
             ents.append({"text": t[s:e], "label": label, "score": score, "start": s, "end": e})
 
     def _has_travel_context() -> bool:
-        keywords = [
-            "train", "railway", "bus", "coach", "flight", "plane", "airport", "station",
-            "pnr", "ticket", "tickets", "booking", "reservation", "seat", "berth", "sleeper",
-        ]
-        return any(k in tl for k in keywords)
+        return any(k in tl for k in _TRAVEL_CONTEXT_KEYWORDS)
 
     # From/To pattern: from X to Y
-    m = re.search(r"\bfrom\s+([a-zA-Z ]{2,40})\s+to\s+([a-zA-Z ]{2,40})\b", tl)
+    m = _FROM_TO_RE.search(tl)
     if m:
         s1, s2 = m.span(1), m.span(2)
         ents.append({"text": t[s1[0]:s1[1]], "label": "source", "score": 0.97, "start": s1[0], "end": s1[1]})
         ents.append({"text": t[s2[0]:s2[1]], "label": "destination", "score": 0.97, "start": s2[0], "end": s2[1]})
 
     # To <city> (destination only)
-    m = re.search(r"\bto\s+([a-zA-Z ]{2,40})\b", tl)
+    m = _TO_CITY_RE.search(tl)
     if m:
         s = m.span(1)
         ents.append({"text": t[s[0]:s[1]], "label": "destination", "score": 0.95, "start": s[0], "end": s[1]})
 
     # On <date> (very loose)
-    # Supports: 12/11/2025, 12-11-2025, 12 Nov, Nov 12, tomorrow, today, next monday
-    date_patterns = [
-        r"\b\d{1,2}[\/-]\d{1,2}(?:[\/-]\d{2,4})?\b",
-        r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\s+\d{1,2}\b",
-        r"\b\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\b",
-        r"\b(?:today|tomorrow|day after tomorrow|next\s+(?:mon|tue|wed|thu|thur|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday))\b",
-    ]
-    for pat in date_patterns:
-        for m in re.finditer(pat, tl):
+    for pat in _DATE_RES:
+        for m in pat.finditer(tl):
             s, e = m.span()
             ents.append({"text": t[s:e], "label": "date", "score": 0.9, "start": s, "end": e})
 
     # Time: 5 pm, 17:30
-    time_patterns = [r"\b\d{1,2}:\d{2}\b", r"\b\d{1,2}\s*(?:am|pm)\b"]
-    for pat in time_patterns:
-        for m in re.finditer(pat, tl):
+    for pat in _TIME_RES:
+        for m in pat.finditer(tl):
             s, e = m.span()
             ents.append({"text": t[s:e], "label": "time", "score": 0.9, "start": s, "end": e})
 
     # Class / quota (only when travel context is present)
     if _has_travel_context():
-        for cls in ["economy", "business", "first class", "sleeper"]:
-            if cls in tl:
-                add_span(cls, "class", 0.92)
-        # Strict patterns for AC classes to avoid matching inside words like "package"
-        add_span_regex(r"\b3a\b", "class", 0.92)
-        add_span_regex(r"\b2a\b", "class", 0.92)
-        add_span_regex(r"\b1a\b", "class", 0.92)
-        add_span_regex(r"\bac\b", "class", 0.92)
-        add_span_regex(r"\bnon[ -]?ac\b", "class", 0.92)
-        for q in ["tatkal", "premium tatkal", "ladies quota", "senior citizen", "general quota", "general"]:
-            if q in tl:
-                add_span(q, "quota", 0.9)
+        for cls in _TRAVEL_CLASSES:
+            add_span(cls, "class", 0.92)
+        for m in _ordered_matches(_AC_CLASS_RE, tl):
+            s, e = m.span()
+            ents.append({"text": t[s:e], "label": "class", "score": 0.92, "start": s, "end": e})
+        add_span_regex(_NON_AC_RE, "class", 0.92)
+        for q in _TRAVEL_QUOTAS:
+            add_span(q, "quota", 0.9)
 
     # Passenger count
-    for m in re.finditer(r"\b(\d+)\s*(?:passengers|passenger|people|persons|adults|kids|children)\b", tl):
+    for m in _PAX_RE.finditer(tl):
         s, e = m.span()
         ents.append({"text": t[s:e], "label": "passenger_count", "score": 0.9, "start": s, "end": e})
 
     return ents
 
 
+def extract_entities(text: str, domains: Iterable[str] = ("food", "health", "travel")) -> List[Dict[str, Any]]:
+    """Rule-based entities for ``text`` from the requested ``domains``.
+
+    The text is lowercased once and shared by every domain helper; food and
+    health vocabularies share a single automaton pass, skipped when neither is
+    requested. Entities are returned travel first, then food, then health.
+    """
+    wanted = set(domains)
+    t = text or ""
+    tl = t.lower()
+    ents: List[Dict[str, Any]] = []
+    if "travel" in wanted:
+        ents += _extract_travel(t, tl)
+    if "food" in wanted or "health" in wanted:
+        food_hits, health_hits = _scan_vocab(tl)
+        if "food" in wanted:
+            ents += _extract_food(t, tl, food_hits)
+        if "health" in wanted:
+            ents += _extract_health(t, tl, health_hits)
+    return ents
+
+
+def _iou_keep_mask(entities: List[Dict[str, Any]]) -> List[bool]:
+    """Greedy same-label IoU suppression over score-sorted entities, with numpy.
+
+    Matches the pairwise loop in _deduplicate_entities: an entity is dropped when
+    an earlier kept entity with the same label overlaps it with IoU >= 0.8.
+    Every entity must have a start and end.
+    """
+    label_ids: Dict[str, int] = {}
+    labels = np.array([label_ids.setdefault(str(e.get("label")).lower(), len(label_ids)) for e in entities])
+    starts = np.array([e["start"] for e in entities])
+    ends = np.array([e["end"] for e in entities])
+    inter = np.maximum(0, np.minimum(ends[:, None], ends) - np.maximum(starts[:, None], starts))
+    lengths = ends - starts
+    union = lengths[:, None] + lengths - inter
+    valid = (inter > 0) & (union > 0)
+    iou = np.divide(inter, union, out=np.zeros(inter.shape, dtype=float), where=valid)
+    suppresses = (labels[:, None] == labels) & (iou >= 0.8)
+
+    kept = np.zeros(len(entities), dtype=bool)
+    for i in range(len(entities)):
+        kept[i] = not (suppresses[i] & kept).any()
+    return kept.tolist()
+
+
 def _deduplicate_entities(source_text: str, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Remove duplicate/overlapping entities keeping the highest-confidence, longest span.
 
@@ -1125,19 +1361,26 @@ def _deduplicate_entities(source_text: str, entities: List[Dict[str, Any]]) -> L
 
     deduped.sort(key=lambda x: float(x.get("score", 0.0)), reverse=True)
     final: List[Dict[str, Any]] = []
-    for e in deduped:
-        keep = True
-        for f in final:
-            if str(e.get("label")).lower() == str(f.get("label")).lower():
-                if iou(e, f) >= 0.8:
-                    keep = False
-                    break
-        if keep:
-            # ensure start/end are ints when present
-            if e.get("start") is not None:
-                e["start"] = int(e["start"])
-            if e.get("end") is not None:
-                e["end"] = int(e["end"])
-            final.append(e)
+    candidates: List[Dict[str, Any]] = []
+    if len(deduped) >= 8 and all(e.get("start") is not None and e.get("end") is not None for e in deduped):
+        keep_mask = _iou_keep_mask(deduped)
+        candidates = [e for e, keep in zip(deduped, keep_mask) if keep]
+    else:
+        for e in deduped:
+            keep = True
+            for f in candidates:
+                if str(e.get("label")).lower() == str(f.get("label")).lower():
+                    if iou(e, f) >= 0.8:
+                        keep = False
+                        break
+            if keep:
+                candidates.append(e)
+    for e in candidates:
+        # ensure start/end are ints when present
+        if e.get("start") is not None:
+            e["start"] = int(e["start"])
+        if e.get("end") is not None:
+            e["end"] = int(e["end"])
+        final.append(e)
 
     return final
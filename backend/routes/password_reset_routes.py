@@ -1,37 +1,88 @@
 """
 Password reset routes - forgot password with OTP verification
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from pydantic import BaseModel, EmailStr
-import random
+import secrets
 import smtplib
+import threading
+from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 from models import RegisterRequest
 from auth import hash_password
-from database import users_col, db
+from database import users_col_async, otp_col_async
 
 router = APIRouter()
 
-# Temporary OTP storage collection
-otp_col = db["password_reset_otps"]
+# Only the fields the OTP checks read
+_OTP_PROJECTION = {"_id": 0, "otp": 1}
+_OTP_MISSING = "No valid OTP found for this email. Please request a new one."
 
 
-class ForgotPasswordRequest(BaseModel):
-    """Request OTP for password reset"""
-    email: EmailStr
+def _live_otp_filter(email: str) -> dict:
+    """Match the email's OTP only while it is unexpired.
+
+    The TTL index on expires_at purges old OTPs, but its monitor only runs
+    about once a minute, so the query still excludes expired records.
+    """
+    return {"email": email, "expires_at": {"$gt": datetime.utcnow()}}
+
+# Email configuration from environment variables
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SENDER_EMAIL = os.getenv("SENDER_EMAIL", "")
+SENDER_PASSWORD = os.getenv("SENDER_PASSWORD", "")
+
+
+class SMTPPool:
+    """A single authenticated SMTP connection shared across sends.
+
+    The STARTTLS + login handshake happens once; if the server has dropped the
+    idle connection, the next send reconnects and retries once.
+    """
+
+    def __init__(self, server: str, port: int, username: str, password: str):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self._conn: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
 
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.server, self.port, timeout=30)
+        conn.starttls()
+        conn.login(self.username, self.password)
+        return conn
 
-class VerifyOTPRequest(BaseModel):
-    """Verify OTP"""
+    def send(self, message) -> None:
+        with self._lock:
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = self._connect()
+                try:
+                    self._conn.send_message(message)
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    self._conn = None
+                    if attempt:
+                        raise
+
+
+_SMTP_POOL = SMTPPool(SMTP_SERVER, SMTP_PORT, SENDER_EMAIL, SENDER_PASSWORD)
+
+
+class ForgotPasswordRequest(BaseModel):
+    """Request OTP for password reset"""
     email: EmailStr
-    otp: str
 
 
 class ResetPasswordRequest(BaseModel):
-    """Reset password with verified OTP"""
+    """Reset password with the emailed OTP"""
     email: EmailStr
     otp: str
     new_password: str
@@ -41,13 +92,7 @@ class ResetPasswordRequest(BaseModel):
 def send_otp_email(email: str, otp: str):
     """Send OTP to user's email"""
     try:
-        # Email configuration from environment variables
-        smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        sender_email = os.getenv("SENDER_EMAIL", "")
-        sender_password = os.getenv("SENDER_PASSWORD", "")
-        
-        if not sender_email or not sender_password:
+        if not SENDER_EMAIL or not SENDER_PASSWORD:
             # For development: just log the OTP
             print(f"[DEV MODE] OTP for {email}: {otp}")
             return True
@@ -55,7 +100,7 @@ def send_otp_email(email: str, otp: str):
         # Create message
         message = MIMEMultipart("alternative")
         message["Subject"] = "Password Reset OTP - Bot Trainer"
-        message["From"] = sender_email
+        message["From"] = SENDER_EMAIL
         message["To"] = email
         
         # Email body
@@ -77,11 +122,8 @@ def send_otp_email(email: str, otp: str):
         part = MIMEText(html, "html")
         message.attach(part)
         
-        # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(message)
+        # Send email over the shared connection
+        _SMTP_POOL.send(message)
         
         return True
     except Exception as e:
@@ -91,33 +133,32 @@ def send_otp_email(email: str, otp: str):
 
 
 @router.post("/forgot-password")
-def forgot_password(data: ForgotPasswordRequest):
+async def forgot_password(data: ForgotPasswordRequest, background_tasks: BackgroundTasks):
     """Send OTP to user's email for password reset"""
     # Check if user exists
-    user = users_col.find_one({"email": data.email})
+    user = await users_col_async.find_one({"email": data.email}, {"_id": 1})
     if not user:
         raise HTTPException(status_code=404, detail="Email not registered")
     
     # Generate 6-digit OTP
-    otp = str(random.randint(100000, 999999))
+    otp = f"{secrets.randbelow(1_000_000):06d}"
     
     # Store OTP in database with expiry (10 minutes)
-    otp_col.update_one(
+    await otp_col_async.update_one(
         {"email": data.email},
         {
             "$set": {
                 "email": data.email,
                 "otp": otp,
                 "created_at": datetime.utcnow(),
-                "expires_at": datetime.utcnow() + timedelta(minutes=10),
-                "verified": False
+                "expires_at": datetime.utcnow() + timedelta(minutes=10)
             }
         },
         upsert=True
     )
     
-    # Send OTP via email
-    send_otp_email(data.email, otp)
+    # Send OTP via email once the response has been sent (runs in the threadpool)
+    background_tasks.add_task(send_otp_email, data.email, otp)
     
     return {
         "message": "OTP sent to your email",
@@ -125,50 +166,17 @@ def forgot_password(data: ForgotPasswordRequest):
     }
 
 
-@router.post("/verify-otp")
-def verify_otp(data: VerifyOTPRequest):
-    """Verify OTP for password reset"""
-    # Find OTP record
-    otp_record = otp_col.find_one({"email": data.email})
-    
-    if not otp_record:
-        raise HTTPException(status_code=404, detail="No OTP found for this email")
-    
-    # Check if OTP is expired
-    if datetime.utcnow() > otp_record["expires_at"]:
-        raise HTTPException(status_code=400, detail="OTP has expired. Please request a new one.")
-    
-    # Verify OTP
-    if otp_record["otp"] != data.otp:
-        raise HTTPException(status_code=400, detail="Invalid OTP")
-    
-    # Mark OTP as verified
-    otp_col.update_one(
-        {"email": data.email},
-        {"$set": {"verified": True}}
-    )
-    
-    return {"message": "OTP verified successfully"}
-
-
 @router.post("/reset-password")
-def reset_password(data: ResetPasswordRequest):
-    """Reset password after OTP verification"""
+async def reset_password(data: ResetPasswordRequest):
+    """Reset password, verifying the OTP in the same request"""
     # Find OTP record
-    otp_record = otp_col.find_one({"email": data.email})
+    otp_record = await otp_col_async.find_one(_live_otp_filter(data.email), _OTP_PROJECTION)
     
+    # Missing and expired OTPs look the same
     if not otp_record:
-        raise HTTPException(status_code=404, detail="No OTP found for this email")
-    
-    # Check if OTP is verified
-    if not otp_record.get("verified"):
-        raise HTTPException(status_code=400, detail="OTP not verified")
+        raise HTTPException(status_code=404, detail=_OTP_MISSING)
     
-    # Check if OTP is expired
-    if datetime.utcnow() > otp_record["expires_at"]:
-        raise HTTPException(status_code=400, detail="OTP has expired. Please request a new one.")
-    
-    # Verify OTP again
+    # Verify OTP
     if otp_record["otp"] != data.otp:
         raise HTTPException(status_code=400, detail="Invalid OTP")
     
@@ -181,10 +189,10 @@ def reset_password(data: ResetPasswordRequest):
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
     
     # Hash new password
-    hashed = hash_password(data.new_password)
+    hashed = await run_in_threadpool(hash_password, data.new_password)
     
     # Update user password
-    result = users_col.update_one(
+    result = await users_col_async.update_one(
         {"email": data.email},
         {"$set": {"password": hashed, "password_updated_at": datetime.utcnow()}}
     )
@@ -193,6 +201,6 @@ def reset_password(data: ResetPasswordRequest):
         raise HTTPException(status_code=404, detail="User not found")
     
     # Delete OTP record
-    otp_col.delete_one({"email": data.email})
+    await otp_col_async.delete_one({"email": data.email})
     
     return {"message": "Password reset successfully"}
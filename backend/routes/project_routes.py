@@ -5,8 +5,8 @@ from fastapi import APIRouter, HTTPException, status, Header
 from typing import Annotated, Optional
 from datetime import datetime
 from models import ProjectCreate
-from auth import decode_token
-from database import projects_col
+from auth import cached_decode_token
+from database import projects_col, projects_col_async
 
 router = APIRouter()
 
@@ -20,7 +20,7 @@ def create_project(data: ProjectCreate, authorization: AuthorizationHeader = Non
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
     project_doc = {
         "name": data.name,
@@ -33,16 +33,16 @@ def create_project(data: ProjectCreate, authorization: AuthorizationHeader = Non
 
 
 @router.get("/projects")
-def get_projects(authorization: AuthorizationHeader = None):
+async def get_projects(authorization: AuthorizationHeader = None):
     """List user projects (requires JWT)"""
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
-    projects = list(projects_col.find(
+    projects = await projects_col_async.find(
         {"owner_email": decoded["email"]},
         {"_id": 0}
-    ))
+    ).to_list(length=None)
     return projects
@@ -1,12 +1,13 @@
 
 import threading
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Annotated, Dict, Optional
+from typing import Annotated, Any, Dict, Optional
 
 from fastapi import APIRouter, Header, HTTPException, status
 from pydantic import BaseModel
 
-from auth import decode_token
+from auth import cached_decode_token
 from database import annotations_col
 
 router = APIRouter()
@@ -14,15 +15,20 @@ router = APIRouter()
 AuthorizationHeader = Annotated[Optional[str], Header(alias="Authorization")]
 
 
-# Global training status (single-user, single-session simple tracker)
-_TRAIN_STATUS: Dict[str, object] = {
-    "state": "idle",  # idle | running | completed | failed
-    "progress": 0,
-    "message": "",
-    "started_at": None,
-    "finished_at": None,
-    "error": None,
-}
+@dataclass(slots=True)
+class TrainStatus:
+    """Global training status (single-user, single-session simple tracker)."""
+    state: str = "idle"  # idle | running | completed | failed
+    progress: int = 0
+    message: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+
+
+# Written by the worker thread and read by request handlers; guard with _TRAIN_LOCK
+_TRAIN_STATUS = TrainStatus()
+_TRAIN_LOCK = threading.Lock()
 
 _TRAIN_THREAD: Optional[threading.Thread] = None
 
@@ -32,18 +38,25 @@ class TrainStartRequest(BaseModel):
 
 
 def _update_status(state: str = None, progress: int = None, message: str = None, error: str = None):
-    if state is not None:
-        _TRAIN_STATUS["state"] = state
-    if progress is not None:
-        _TRAIN_STATUS["progress"] = int(max(0, min(100, progress)))
-    if message is not None:
-        _TRAIN_STATUS["message"] = message
-    if error is not None:
-        _TRAIN_STATUS["error"] = error
-    if state == "running" and _TRAIN_STATUS.get("started_at") is None:
-        _TRAIN_STATUS["started_at"] = datetime.utcnow().isoformat()
-    if state in {"completed", "failed"}:
-        _TRAIN_STATUS["finished_at"] = datetime.utcnow().isoformat()
+    with _TRAIN_LOCK:
+        if state is not None:
+            _TRAIN_STATUS.state = state
+        if progress is not None:
+            _TRAIN_STATUS.progress = int(max(0, min(100, progress)))
+        if message is not None:
+            _TRAIN_STATUS.message = message
+        if error is not None:
+            _TRAIN_STATUS.error = error
+        if state == "running" and _TRAIN_STATUS.started_at is None:
+            _TRAIN_STATUS.started_at = datetime.utcnow().isoformat()
+        if state in {"completed", "failed"}:
+            _TRAIN_STATUS.finished_at = datetime.utcnow().isoformat()
+
+
+def _status_snapshot() -> Dict[str, Any]:
+    """Consistent copy of the training status for API responses."""
+    with _TRAIN_LOCK:
+        return asdict(_TRAIN_STATUS)
 
 
 def _train_worker(owner_email: str, req: TrainStartRequest):
@@ -60,7 +73,7 @@ def _train_worker(owner_email: str, req: TrainStartRequest):
 
         # Simulate quick completion without actually training models.
         _update_status(progress=100, message="Training skipped (transformer models disabled).")
-        _update_status("completed", 100, _TRAIN_STATUS.get("message") or "Training complete.")
+        _update_status("completed", 100, _status_snapshot()["message"] or "Training complete.")
     except Exception as e:
         _update_status("failed", error=str(e), message=f"Training failed: {e}")
 
@@ -71,23 +84,28 @@ def start_training(req: TrainStartRequest, authorization: AuthorizationHeader =
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    decoded = cached_decode_token(token)
 
-    if _TRAIN_STATUS.get("state") == "running":
-        return {"message": "Training already in progress", "status": _TRAIN_STATUS}
+    # Check-and-claim under the lock so two requests cannot both start a worker
+    with _TRAIN_LOCK:
+        already_running = _TRAIN_STATUS.state == "running"
+        if not already_running:
+            _TRAIN_STATUS.state = "running"
+    if already_running:
+        return {"message": "Training already in progress", "status": _status_snapshot()}
 
     _update_status("running", 0, "Initializing training…", None)
     global _TRAIN_THREAD
     _TRAIN_THREAD = threading.Thread(target=_train_worker, args=(decoded["email"], req), daemon=True)
     _TRAIN_THREAD.start()
-    return {"message": "Training started", "status": _TRAIN_STATUS}
+    return {"message": "Training started", "status": _status_snapshot()}
 
 
 @router.get("/train/status", status_code=status.HTTP_200_OK)
-def training_status(authorization: AuthorizationHeader = None):
+async def training_status(authorization: AuthorizationHeader = None):
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     # Only validates token
     token = authorization.replace("Bearer ", "")
-    decode_token(token)
-    return _TRAIN_STATUS
+    cached_decode_token(token)
+    return _status_snapshot()
@@ -1,41 +1,52 @@
 """
 Workspace management routes
 """
-from fastapi import APIRouter, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.responses import ORJSONResponse
 from typing import Annotated, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from uuid import uuid4
 from models import WorkspaceCreate, WorkspaceSelect
-from auth import decode_token
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from auth import cached_decode_token
 from database import workspaces_col
 
-router = APIRouter()
+# Workspace lists grow with the user; serialize them with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
 
 AuthorizationHeader = Annotated[Optional[str], Header(alias="Authorization")]
 
+_UTC = timezone.utc
 
-def _ensure_root(owner_email: str):
-    root = workspaces_col.find_one({"owner_email": owner_email})
-    if not root:
-        root = {
-            "owner_email": owner_email,
-            "workspaces": [],
-            "selected_workspace_id": None,
-            "created_at": datetime.utcnow(),
-        }
-        workspaces_col.insert_one(root)
-    return root
 
-
-@router.get("/workspaces")
-def get_workspaces(authorization: AuthorizationHeader = None):
-    """List user workspaces and current selection (requires JWT)"""
+async def get_current_email(authorization: AuthorizationHeader = None) -> str:
+    """Resolve the caller's email from the Bearer token (dependency, resolved once per request)"""
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
-    token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
+    token = authorization[7:] if authorization.startswith("Bearer ") else authorization
+    return cached_decode_token(token)["email"]
+
+
+def _append_workspace(email, pipeline):
+    """Run the create pipeline against the user's root doc, returning only the last workspace"""
+    return workspaces_col.find_one_and_update(
+        {"owner_email": email},
+        pipeline,
+        projection={"_id": 0, "workspaces": {"$slice": -1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
 
-    root = _ensure_root(decoded["email"])
+
+@router.get("/workspaces")
+def get_workspaces(email: str = Depends(get_current_email)):
+    """List user workspaces and current selection (requires JWT)"""
+    root = workspaces_col.find_one(
+        {"owner_email": email},
+        {"_id": 0, "workspaces": 1, "selected_workspace_id": 1},
+    ) or {}
     return {
         "workspaces": root.get("workspaces", []),
         "selected_workspace_id": root.get("selected_workspace_id"),
@@ -43,57 +54,58 @@ def get_workspaces(authorization: AuthorizationHeader = None):
 
 
 @router.post("/workspaces/create", status_code=status.HTTP_201_CREATED)
-def create_workspace(data: WorkspaceCreate, authorization: AuthorizationHeader = None):
+def create_workspace(data: WorkspaceCreate, email: str = Depends(get_current_email)):
     """Create a new workspace (requires JWT)"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
-
-    root = _ensure_root(decoded["email"])
-    # prevent duplicate names
-    if any(w.get("name") == data.name for w in root.get("workspaces", [])):
-        raise HTTPException(status_code=409, detail="Workspace with that name already exists")
-
-    from uuid import uuid4
     wid = uuid4().hex[:12]
+    now = datetime.now(_UTC)
     ws_doc = {
         "id": wid,
         "name": data.name,
         "description": data.description or "",
-        "created_at": datetime.utcnow(),
+        "created_at": now,
     }
-    workspaces_col.update_one(
-        {"owner_email": decoded["email"]},
-        {"$push": {"workspaces": ws_doc}},
-        upsert=True,
-    )
-    # Auto-select if none selected
-    if not root.get("selected_workspace_id"):
-        workspaces_col.update_one(
-            {"owner_email": decoded["email"]},
-            {"$set": {"selected_workspace_id": wid}},
-        )
+    # Single round-trip: create the root doc if missing, append the workspace
+    # unless the name is taken (prevent duplicate names), and auto-select it if
+    # none is selected. User values are wrapped in $literal so a leading "$"
+    # is never read as a field path.
+    pipeline = [
+        {"$set": {"_name_taken": {"$in": [{"$literal": data.name}, {"$ifNull": ["$workspaces.name", []]}]}}},
+        {"$set": {
+            "created_at": {"$ifNull": ["$created_at", now]},
+            "workspaces": {"$cond": [
+                "$_name_taken",
+                "$workspaces",
+                {"$concatArrays": [{"$ifNull": ["$workspaces", []]}, [{"$literal": ws_doc}]]},
+            ]},
+            "selected_workspace_id": {"$cond": [
+                "$_name_taken",
+                "$selected_workspace_id",
+                {"$ifNull": ["$selected_workspace_id", wid]},
+            ]},
+        }},
+        {"$unset": "_name_taken"},
+    ]
+    try:
+        root = _append_workspace(email, pipeline)
+    except DuplicateKeyError:
+        # A concurrent first create inserted the root doc (owner_email is unique); apply to it instead
+        root = _append_workspace(email, pipeline)
+    last = (root or {}).get("workspaces") or [{}]
+    if last[-1].get("id") != wid:
+        raise HTTPException(status_code=409, detail="Workspace with that name already exists")
 
     return {"message": "Workspace created successfully", "workspace": ws_doc}
 
 
 @router.post("/workspaces/select")
-def select_workspace(data: WorkspaceSelect, authorization: AuthorizationHeader = None):
+def select_workspace(data: WorkspaceSelect, email: str = Depends(get_current_email)):
     """Select active workspace (requires JWT)"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    token = authorization.replace("Bearer ", "")
-    decoded = decode_token(token)
-
-    root = _ensure_root(decoded["email"])
-    if not any(w.get("id") == data.workspace_id for w in root.get("workspaces", [])):
-        raise HTTPException(status_code=404, detail="Workspace not found")
-
-    workspaces_col.update_one(
-        {"owner_email": decoded["email"]},
+    # Only matches when the workspace belongs to this user
+    selected = workspaces_col.find_one_and_update(
+        {"owner_email": email, "workspaces.id": data.workspace_id},
         {"$set": {"selected_workspace_id": data.workspace_id}},
+        projection={"_id": 1},
     )
+    if selected is None:
+        raise HTTPException(status_code=404, detail="Workspace not found")
     return {"message": "Workspace selected", "workspace_id": data.workspace_id}
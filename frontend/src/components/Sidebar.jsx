@@ -5,7 +5,10 @@ import { useAuthStore } from '../store/authStore';
 import { APP_CONFIG } from '../config/config';
 
 export const Sidebar = () => {
-  const { isAuthenticated, user, logout, loginTimestamp } = useAuthStore();
+  const isAuthenticated = useAuthStore((state) => state.isAuthenticated);
+  const user = useAuthStore((state) => state.user);
+  const logout = useAuthStore((state) => state.logout);
+  const loginTimestamp = useAuthStore((state) => state.loginTimestamp);
   const location = useLocation();
   const [sessionTime, setSessionTime] = useState('');
 
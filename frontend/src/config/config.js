@@ -6,6 +6,8 @@ export const APP_CONFIG = {
   version: '1.0.0',
   tokenKey: 'bot_trainer_token',
   userKey: 'bot_trainer_user',
+  requestTimeoutMs: 30000,
+  authRequestTimeoutMs: 10000,
 };
 
 export const ROUTES = {
@@ -4,7 +4,31 @@ import {
   Users, Trash2, Key, Database, Download, FolderOpen,
   RefreshCw, Activity, BarChart3, Eye, EyeOff, AlertCircle, X, Check
 } from 'lucide-react';
-import api from '../services/api';
+import api, { LONG_REQUEST } from '../services/api';
+
+// Shared en-GB formatters: toLocale(Date)String builds a fresh Intl.DateTimeFormat
+// on every call, once per row of the admin tables and activity logs
+const DATE_FORMAT = new Intl.DateTimeFormat('en-GB');
+const DATETIME_FORMAT = new Intl.DateTimeFormat('en-GB', {
+  year: 'numeric',
+  month: 'numeric',
+  day: 'numeric',
+  hour: 'numeric',
+  minute: 'numeric',
+  second: 'numeric'
+});
+const MODEL_SAVED_FORMAT = new Intl.DateTimeFormat('en-GB', {
+  year: 'numeric',
+  month: '2-digit',
+  day: '2-digit',
+  hour: '2-digit',
+  minute: '2-digit'
+});
+
+const formatDate = (value, formatter) => {
+  const date = new Date(value);
+  return Number.isNaN(date.getTime()) ? 'Invalid Date' : formatter.format(date);
+};
 
 export const AdminPanelPage = () => {
   const [activeSection, setActiveSection] = useState('users');
@@ -158,7 +182,7 @@ export const AdminPanelPage = () => {
 
   const handleDownloadWorkspace = async (workspaceId, workspaceName) => {
     try {
-      const response = await api.get(`/admin/workspaces/${workspaceId}/download`);
+      const response = await api.get(`/admin/workspaces/${workspaceId}/download`, LONG_REQUEST);
       const dataStr = JSON.stringify(response.data, null, 2);
       const dataBlob = new Blob([dataStr], { type: 'application/json' });
       const url = URL.createObjectURL(dataBlob);
@@ -192,7 +216,7 @@ export const AdminPanelPage = () => {
 
   const handleDownloadDataset = async (workspaceId, workspaceName, format = 'csv') => {
     try {
-      const response = await api.get(`/admin/datasets/${workspaceId}/download`);
+      const response = await api.get(`/admin/datasets/${workspaceId}/download`, LONG_REQUEST);
       const data = response.data;
       
       if (!data.data || data.data.length === 0) {
@@ -471,7 +495,7 @@ export const AdminPanelPage = () => {
                               </span>
                             </td>
                             <td className="p-3" style={{ color: 'rgba(228, 247, 238, 0.65)' }}>
-                              {new Date(user.created_at).toLocaleDateString('en-GB')}
+                              {formatDate(user.created_at, DATE_FORMAT)}
                             </td>
                             <td className="p-3 text-right">
                               <div className="flex justify-end gap-2">
@@ -538,7 +562,7 @@ export const AdminPanelPage = () => {
                                 Owner: <span style={{ color: '#32beff' }}>{workspace.owner_email}</span>
                               </span>
                               <span style={{ color: 'rgba(228, 247, 238, 0.65)' }}>
-                                Created: {new Date(workspace.created_at).toLocaleDateString('en-GB')}
+                                Created: {formatDate(workspace.created_at, DATE_FORMAT)}
                               </span>
                             </div>
                           </div>
@@ -596,7 +620,7 @@ export const AdminPanelPage = () => {
                             <td className="p-3" style={{ color: '#2bf06f' }}>{dataset.sample_count}</td>
                             <td className="p-3" style={{ color: 'rgba(228, 247, 238, 0.65)' }}>{dataset.owner_email}</td>
                             <td className="p-3" style={{ color: 'rgba(228, 247, 238, 0.65)' }}>
-                              {new Date(dataset.uploaded_at).toLocaleDateString('en-GB')}
+                              {formatDate(dataset.uploaded_at, DATE_FORMAT)}
                             </td>
                             <td className="p-3 text-right">
                               <div className="flex justify-end gap-2">
@@ -671,13 +695,7 @@ export const AdminPanelPage = () => {
                               {typeof model.f1_score === 'number' ? `${(model.f1_score * 100).toFixed(2)}%` : model.f1_score}
                             </td>
                             <td className="p-3" style={{ color: 'rgba(228, 247, 238, 0.65)' }}>
-                              {model.saved_at ? new Date(model.saved_at).toLocaleString('en-GB', {
-                                year: 'numeric',
-                                month: '2-digit',
-                                day: '2-digit',
-                                hour: '2-digit',
-                                minute: '2-digit'
-                              }) : 'N/A'}
+                              {model.saved_at ? formatDate(model.saved_at, MODEL_SAVED_FORMAT) : 'N/A'}
                             </td>
                             <td className="p-3 text-right">
                               <button
@@ -736,7 +754,7 @@ export const AdminPanelPage = () => {
                               </p>
                             </div>
                             <span className="text-xs" style={{ color: 'rgba(228, 247, 238, 0.55)' }}>
-                              {log.uploaded_at !== 'Invalid Date' ? new Date(log.uploaded_at).toLocaleString('en-GB') : 'Invalid Date'}
+                              {formatDate(log.uploaded_at, DATETIME_FORMAT)}
                             </span>
                           </div>
                         </div>
@@ -769,7 +787,7 @@ export const AdminPanelPage = () => {
                               </p>
                             </div>
                             <span className="text-xs" style={{ color: 'rgba(228, 247, 238, 0.55)' }}>
-                              {log.saved_at ? new Date(log.saved_at).toLocaleString('en-GB') : 'N/A'}
+                              {log.saved_at ? formatDate(log.saved_at, DATETIME_FORMAT) : 'N/A'}
                             </span>
                           </div>
                         </div>
@@ -802,7 +820,7 @@ export const AdminPanelPage = () => {
                               </p>
                             </div>
                             <span className="text-xs" style={{ color: 'rgba(228, 247, 238, 0.55)' }}>
-                              {log.created_at ? new Date(log.created_at).toLocaleString('en-GB') : 'N/A'}
+                              {log.created_at ? formatDate(log.created_at, DATETIME_FORMAT) : 'N/A'}
                             </span>
                           </div>
                         </div>
@@ -835,7 +853,7 @@ export const AdminPanelPage = () => {
                               </p>
                             </div>
                             <span className="text-xs" style={{ color: 'rgba(228, 247, 238, 0.55)' }}>
-                              {log.created_at ? new Date(log.created_at).toLocaleString('en-GB') : 'N/A'}
+                              {log.created_at ? formatDate(log.created_at, DATETIME_FORMAT) : 'N/A'}
                             </span>
                           </div>
                         </div>
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useMemo, useDeferredValue } from 'react';
 import { toast } from 'react-hot-toast';
 import { 
   Upload, FileText, BarChart3, Plus, RefreshCw, 
@@ -9,7 +9,7 @@ import { Loader } from '../components/common/Loader';
 import { workspaceService } from '../services/workspaceService';
 import { datasetService } from '../services/datasetService';
 import { trainingService } from '../services/trainingService';
-import api from '../services/api';
+import api, { LONG_REQUEST } from '../services/api';
 import { useAuthStore } from '../store/authStore';
 import { useWorkspaceStore } from '../store/workspaceStore';
 import { useDatasetStore } from '../store/datasetStore';
@@ -95,7 +95,7 @@ export const DashboardPage = () => {
 // Workspace Selector Component
 const WorkspaceSelector = () => {
   const { workspaces, selectedWorkspace, setWorkspaces, setSelectedWorkspace } = useWorkspaceStore();
-  const { clearDatasets } = useDatasetStore();
+  const clearDatasets = useDatasetStore((state) => state.clearDatasets);
   const [loading, setLoading] = useState(false);
   const [showCreateForm, setShowCreateForm] = useState(false);
   const [newWorkspace, setNewWorkspace] = useState({ name: '', description: '' });
@@ -271,10 +271,44 @@ const WorkspaceSelector = () => {
   );
 };
 
+// SHA-256 of the uploaded bytes, used for the workspace-scoped dataset checksum
+const hashContent = async (buffer) => {
+  if (!window.crypto?.subtle) return null; // insecure context: server assigns the checksum
+  const digest = await window.crypto.subtle.digest('SHA-256', buffer);
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+};
+
+// Column-name patterns (matched against the lowercased name) used to classify dataset columns
+const TEXT_COLUMN_RE = /text|sentence|utterance|query|message|input/;
+const INTENT_COLUMN_RE = /intent|label|category|class/;
+const ENTITY_COLUMN_RE = /entity|entities|ner|tags/;
+
+// Counts of the non-empty values of the given columns (Map keys keep first-seen
+// order), gathered in one pass without an intermediate rows x columns array
+const countValues = (data, cols) => {
+  const counts = new Map();
+  if (cols.length === 1) {
+    // Most datasets have a single intent/entity column: skip the inner column loop
+    const col = cols[0];
+    for (const row of data) {
+      const value = row[col];
+      if (value) counts.set(value, (counts.get(value) || 0) + 1);
+    }
+    return counts;
+  }
+  for (const row of data) {
+    for (const col of cols) {
+      const value = row[col];
+      if (value) counts.set(value, (counts.get(value) || 0) + 1);
+    }
+  }
+  return counts;
+};
+
 // Upload Tab Component
 const UploadTab = () => {
   const selectedWorkspace = useWorkspaceStore((state) => state.selectedWorkspace);
-  const { addUploadedFile } = useDatasetStore();
+  const addUploadedFile = useDatasetStore((state) => state.addUploadedFile);
   const [file, setFile] = useState(null);
   const [loading, setLoading] = useState(false);
 
@@ -282,15 +316,25 @@ const UploadTab = () => {
     setFile(e.target.files[0]);
   };
 
+  // Walks the text line by line instead of splitting it into (and then
+  // filtering) a full array of lines, so only the parsed rows are kept
   const parseCSV = (text) => {
-    const lines = text.split('\n').filter(line => line.trim());
-    if (lines.length === 0) return [];
-    
-    const headers = lines[0].split(',').map(h => h.trim());
+    let headers = null;
     const data = [];
     
-    for (let i = 1; i < lines.length; i++) {
-      const values = lines[i].split(',').map(v => v.trim());
+    let start = 0;
+    while (start < text.length) {
+      let end = text.indexOf('\n', start);
+      if (end === -1) end = text.length;
+      const line = text.slice(start, end);
+      start = end + 1;
+      if (!line.trim()) continue;
+
+      const values = line.split(',').map(v => v.trim());
+      if (!headers) {
+        headers = values;
+        continue;
+      }
       const row = {};
       headers.forEach((header, index) => {
         row[header] = values[index] || '';
@@ -302,39 +346,27 @@ const UploadTab = () => {
   };
 
   const analyzeData = (data, filename) => {
-    // Find text/sentence columns
-    const textFields = ['text', 'sentence', 'utterance', 'query', 'message', 'input'];
-    const intentFields = ['intent', 'label', 'category', 'class'];
-    const entityFields = ['entity', 'entities', 'ner', 'tags'];
-    
     const columns = data.length > 0 ? Object.keys(data[0]) : [];
     
-    const textCol = columns.find(col => 
-      textFields.some(field => col.toLowerCase().includes(field))
-    );
-    
-    const intentCols = columns.filter(col =>
-      intentFields.some(field => col.toLowerCase().includes(field))
-    );
-    
-    const entityCols = columns.filter(col =>
-      entityFields.some(field => col.toLowerCase().includes(field))
-    );
+    // Classify text/intent/entity columns in one sweep, lowercasing each name once
+    let textCol;
+    const intentCols = [];
+    const entityCols = [];
+    for (const col of columns) {
+      const lower = col.toLowerCase();
+      if (!textCol && TEXT_COLUMN_RE.test(lower)) textCol = col;
+      if (INTENT_COLUMN_RE.test(lower)) intentCols.push(col);
+      if (ENTITY_COLUMN_RE.test(lower)) entityCols.push(col);
+    }
     
     // Extract sentences
     const sentences = textCol 
       ? data.map(row => row[textCol]).filter(s => s)
       : [];
     
-    // Extract unique intents
-    const intents = intentCols.length > 0
-      ? [...new Set(data.flatMap(row => intentCols.map(col => row[col])).filter(v => v))]
-      : [];
-    
-    // Extract unique entities
-    const entities = entityCols.length > 0
-      ? [...new Set(data.flatMap(row => entityCols.map(col => row[col])).filter(v => v))]
-      : [];
+    // Unique intents and entities
+    const intentCounts = countValues(data, intentCols);
+    const entityCounts = countValues(data, entityCols);
     
     // Create analysis object
     return {
@@ -347,8 +379,8 @@ const UploadTab = () => {
       full_records: data,
       intent_columns: intentCols,
       entity_columns: entityCols,
-      intents: intents,
-      entities: entities,
+      intents: [...intentCounts.keys()],
+      entities: [...entityCounts.keys()],
       intent_distribution: [],
       entity_distribution: [],
     };
@@ -367,64 +399,71 @@ const UploadTab = () => {
 
     setLoading(true);
     try {
-      const reader = new FileReader();
-      
-      reader.onload = async (e) => {
+      const buffer = await file.arrayBuffer();
+      const contentKey = await hashContent(buffer);
+      // The same bytes uploaded into the same workspace always get the same checksum
+      const checksum = contentKey ? `${contentKey}-${selectedWorkspace.id}` : undefined;
+
+      // Check the history we already hold (checksums are workspace-scoped), so
+      // new uploads don't pay an extra request
+      let reused = false;
+      const history = datasetService.getCachedDatasets();
+      if (checksum && history?.entries?.some((entry) => entry.checksum === checksum)) {
         try {
-          const content = e.target.result;
-          let data = [];
-          
-          // Parse based on file type
-          if (file.name.endsWith('.json')) {
-            data = JSON.parse(content);
-            if (!Array.isArray(data)) {
-              data = [data];
-            }
-          } else if (file.name.endsWith('.csv')) {
-            data = parseCSV(content);
-          }
-          
-          // Analyze the data
-          const analysis = analyzeData(data, file.name);
-          
-          // Prepare payload
-          const payload = {
-            filename: file.name,
-            analysis: analysis,
-            evaluation: {},
-          };
-          
-          // Upload to backend
-          await datasetService.uploadDataset(payload);
-          toast.success('Dataset uploaded successfully!');
-          
-          // Notify store about new upload
-          addUploadedFile({
-            filename: file.name,
-            uploadedAt: new Date().toISOString(),
-          });
-          
-          setFile(null);
-          
-          // Refresh the file input
-          const fileInput = document.getElementById('file-upload');
-          if (fileInput) fileInput.value = '';
+          // Already saved: select the stored copy instead of re-parsing and re-uploading
+          await datasetService.selectDataset(checksum);
+          toast.success('Dataset already uploaded - selected the saved copy');
+          reused = true;
         } catch (error) {
-          console.error('Error processing file:', error);
-          toast.error('Failed to process file: ' + error.message);
-        } finally {
-          setLoading(false);
+          // The cached history was stale (entry since evicted); upload it again
         }
-      };
+      }
+
+      if (!reused) {
+        const content = new TextDecoder().decode(buffer);
+        let data = [];
+        
+        // Parse based on file type
+        if (file.name.endsWith('.json')) {
+          data = JSON.parse(content);
+          if (!Array.isArray(data)) {
+            data = [data];
+          }
+        } else if (file.name.endsWith('.csv')) {
+          data = parseCSV(content);
+        }
+        
+        // Analyze the data
+        const analysis = analyzeData(data, file.name);
+        
+        // Prepare payload
+        const payload = {
+          filename: file.name,
+          analysis: analysis,
+          evaluation: {},
+          checksum,
+        };
+        
+        // Upload to backend
+        await datasetService.uploadDataset(payload);
+        toast.success('Dataset uploaded successfully!');
+      }
       
-      reader.onerror = () => {
-        toast.error('Failed to read file');
-        setLoading(false);
-      };
+      // Notify store about new upload
+      addUploadedFile({
+        filename: file.name,
+        uploadedAt: new Date().toISOString(),
+      });
+      
+      setFile(null);
       
-      reader.readAsText(file);
+      // Refresh the file input
+      const fileInput = document.getElementById('file-upload');
+      if (fileInput) fileInput.value = '';
     } catch (error) {
-      toast.error('Failed to upload dataset');
+      console.error('Error processing file:', error);
+      toast.error('Failed to process file: ' + error.message);
+    } finally {
       setLoading(false);
     }
   };
@@ -478,6 +517,28 @@ const UploadTab = () => {
 };
 
 // View Data Tab Component
+// Recent dataset card styles, shared by every row instead of rebuilt per render
+const DATASET_CARD_STYLES = {
+  selected: {
+    card: {
+      background: 'rgba(50, 244, 122, 0.15)',
+      borderColor: 'var(--accent)',
+      boxShadow: '0 0 20px rgba(50, 244, 122, 0.2)'
+    },
+    title: { color: '#04130a' },
+    meta: { color: 'rgba(4, 19, 10, 0.7)' },
+  },
+  idle: {
+    card: {
+      background: 'rgba(255, 255, 255, 0.04)',
+      borderColor: 'rgba(255, 255, 255, 0.15)'
+    },
+    title: { color: '#f3f8ff' },
+    meta: { color: 'rgba(243, 248, 255, 0.7)' },
+  },
+};
+const DATASET_ICON_STYLE = { color: 'var(--accent)' };
+
 const ViewDataTab = () => {
   const selectedWorkspace = useWorkspaceStore((state) => state.selectedWorkspace);
   const { datasets, setDatasets, selectedDataset, setSelectedDataset, uploadedFiles } = useDatasetStore();
@@ -485,6 +546,65 @@ const ViewDataTab = () => {
   const [datasetContent, setDatasetContent] = useState(null);
   const [loadingContent, setLoadingContent] = useState(false);
 
+  // Parse/format each timestamp once per fetched list, not on every re-render
+  // (selecting a dataset or loading its preview re-renders this list)
+  const datasetRows = useMemo(
+    () => datasets.map((dataset) => ({
+      dataset,
+      updatedLabel: dataset.updated_at ? new Date(dataset.updated_at).toLocaleString() : null,
+    })),
+    [datasets]
+  );
+
+  // Materialize the content table once per loaded dataset: headers are the union
+  // of every record's keys (first-seen order), collected in the same pass that
+  // stringifies each row's cells by header position; missing values render empty
+  const contentTable = useMemo(() => {
+    const content = datasetContent?.content;
+    const records = content?.full_records?.length > 0
+      ? content.full_records
+      : content?.sample_records || [];
+    if (records.length === 0) return null;
+    const columnIndex = new Map();
+    const rows = records.map((record) => {
+      const cells = [];
+      for (const column in record) {
+        let index = columnIndex.get(column);
+        if (index === undefined) {
+          index = columnIndex.size;
+          columnIndex.set(column, index);
+        }
+        cells[index] = String(record[column] ?? '');
+      }
+      return cells;
+    });
+    return {
+      columns: [...columnIndex.keys()],
+      rows,
+      isLargeDataset: content?.full_records?.length > 100,
+    };
+  }, [datasetContent]);
+
+  // Build the table body elements once per loaded dataset; React skips
+  // reconciling an identical element, so unrelated state changes (list
+  // reloads, selection) don't walk every row again
+  const contentTableBody = useMemo(() => contentTable && (
+    <tbody className="divide-y divide-gray-200">
+      {contentTable.rows.map((cells, idx) => (
+        <tr key={idx} className="hover:bg-gray-50">
+          <td className="px-4 py-2 text-gray-500 text-xs">
+            {idx + 1}
+          </td>
+          {contentTable.columns.map((column, colIdx) => (
+            <td key={colIdx} className="px-4 py-2 text-gray-600">
+              {cells[colIdx] ?? ''}
+            </td>
+          ))}
+        </tr>
+      ))}
+    </tbody>
+  ), [contentTable]);
+
   useEffect(() => {
     if (selectedWorkspace) {
       fetchDatasets();
@@ -574,49 +694,36 @@ const ViewDataTab = () => {
       <div>
         <h3 className="text-lg font-semibold mb-3" style={{ color: '#f3f8ff' }}>Recent Datasets</h3>
         <div className="space-y-2">
-          {datasets.map((dataset) => (
-            <div
-              key={dataset.checksum}
-              onClick={() => handleSelectDataset(dataset)}
-              className="p-4 border-2 rounded-lg cursor-pointer transition-all"
-              style={
-                selectedDataset?.checksum === dataset.checksum
-                  ? { 
-                      background: 'rgba(50, 244, 122, 0.15)',
-                      borderColor: 'var(--accent)',
-                      boxShadow: '0 0 20px rgba(50, 244, 122, 0.2)'
-                    }
-                  : { 
-                      background: 'rgba(255, 255, 255, 0.04)',
-                      borderColor: 'rgba(255, 255, 255, 0.15)'
-                    }
-              }
-            >
-              <div className="flex items-center justify-between">
-                <div className="flex items-center gap-3">
-                  <Database style={{ color: 'var(--accent)' }} size={24} />
-                  <div>
-                    <h4 className="font-semibold" style={{ 
-                      color: selectedDataset?.checksum === dataset.checksum ? '#04130a' : '#f3f8ff'
-                    }}>
-                      {selectedDataset?.checksum === dataset.checksum && '✓ '}
-                      {dataset.filename}
-                    </h4>
-                    <p className="text-sm" style={{ 
-                      color: selectedDataset?.checksum === dataset.checksum 
-                        ? 'rgba(4, 19, 10, 0.7)' 
-                        : 'rgba(243, 248, 255, 0.7)'
-                    }}>
-                      {dataset.sentence_count || 0} sentences
-                      {dataset.updated_at && (
-                        <> • {new Date(dataset.updated_at).toLocaleString()}</>
-                      )}
-                    </p>
+          {datasetRows.map(({ dataset, updatedLabel }) => {
+            const isSelected = selectedDataset?.checksum === dataset.checksum;
+            const styles = isSelected ? DATASET_CARD_STYLES.selected : DATASET_CARD_STYLES.idle;
+            return (
+              <div
+                key={dataset.checksum}
+                onClick={() => handleSelectDataset(dataset)}
+                className="p-4 border-2 rounded-lg cursor-pointer transition-all"
+                style={styles.card}
+              >
+                <div className="flex items-center justify-between">
+                  <div className="flex items-center gap-3">
+                    <Database style={DATASET_ICON_STYLE} size={24} />
+                    <div>
+                      <h4 className="font-semibold" style={styles.title}>
+                        {isSelected && '✓ '}
+                        {dataset.filename}
+                      </h4>
+                      <p className="text-sm" style={styles.meta}>
+                        {dataset.sentence_count || 0} sentences
+                        {updatedLabel && (
+                          <> • {updatedLabel}</>
+                        )}
+                      </p>
+                    </div>
                   </div>
                 </div>
               </div>
-            </div>
-          ))}
+            );
+          })}
         </div>
       </div>
 
@@ -658,55 +765,36 @@ const ViewDataTab = () => {
               </div>
 
               {/* Full Data Table */}
-              {(() => {
-                const displayData = datasetContent.content?.full_records && 
-                                   datasetContent.content.full_records.length > 0
-                  ? datasetContent.content.full_records
-                  : datasetContent.content?.sample_records || [];
-                
-                if (displayData.length === 0) return null;
+              {contentTable && (() => {
+                const { columns, rows, isLargeDataset } = contentTable;
 
                 return (
                   <div className="card">
                     <div className="flex justify-between items-center mb-3">
                       <h4 className="font-semibold">
-                        Dataset Content ({displayData.length} rows)
+                        Dataset Content ({rows.length} rows)
                       </h4>
-                      {datasetContent.content?.full_records && 
-                       datasetContent.content.full_records.length > 100 && (
+                      {isLargeDataset && (
                         <span className="text-sm text-gray-500">
-                          Showing all {displayData.length} rows
+                          Showing all {rows.length} rows
                         </span>
                       )}
                     </div>
-                    <div className="overflow-x-auto max-h-[600px] overflow-y-auto">
+                    <div className="overflow-x-auto max-h-[600px] overflow-y-auto lazy-render">
                       <table className="w-full text-sm">
                         <thead className="bg-gray-50 sticky top-0">
                           <tr>
                             <th className="px-4 py-2 text-left font-medium text-gray-700 w-12">
                               #
                             </th>
-                            {Object.keys(displayData[0]).map((header) => (
+                            {columns.map((header) => (
                               <th key={header} className="px-4 py-2 text-left font-medium text-gray-700">
                                 {header}
                               </th>
                             ))}
                           </tr>
                         </thead>
-                        <tbody className="divide-y divide-gray-200">
-                          {displayData.map((row, idx) => (
-                            <tr key={idx} className="hover:bg-gray-50">
-                              <td className="px-4 py-2 text-gray-500 text-xs">
-                                {idx + 1}
-                              </td>
-                              {Object.values(row).map((value, colIdx) => (
-                                <td key={colIdx} className="px-4 py-2 text-gray-600">
-                                  {String(value)}
-                                </td>
-                              ))}
-                            </tr>
-                          ))}
-                        </tbody>
+                        {contentTableBody}
                       </table>
                     </div>
                   </div>
@@ -829,7 +917,7 @@ const AnnotateTab = () => {
         text: sentence,
         model_id: selectedModel,
         include_rules: true,
-      });
+      }, LONG_REQUEST);
 
       const data = response.data;
       setPrediction(data);
@@ -847,13 +935,13 @@ const AnnotateTab = () => {
       }
       
       // Process entities from response
+      const sentenceLower = sentence.toLowerCase();
       const processedEntities = (data.entities || []).map((ent) => {
         const text = ent.text || ent.word || '';
         const label = ent.label || ent.entity || ent.entity_group || 'other';
         const confidence = ent.score || ent.confidence || 'auto';
         
         // Find position in sentence
-        const sentenceLower = sentence.toLowerCase();
         const textLower = text.toLowerCase();
         const start = ent.start ?? sentenceLower.indexOf(textLower);
         const end = ent.end ?? (start !== -1 ? start + text.length : -1);
@@ -964,7 +1052,7 @@ const AnnotateTab = () => {
 
       const trainToast = toast.loading(`⚙️ Training ${modelName} with ${texts.length} samples...`);
       
-      const response = await api.post(endpoint, payload);
+      const response = await api.post(endpoint, payload, LONG_REQUEST);
       
       toast.dismiss(trainToast);
       
@@ -1315,6 +1403,19 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
     setResults(null);
   }, [selectedModel]);
 
+  // Format the per-intent table once per evaluation; moving the train split
+  // slider re-renders this tab while the previous results are still shown
+  const perClassRows = useMemo(
+    () => Object.entries(results?.per_class_metrics || {}).map(([intent, metrics]) => ({
+      intent,
+      precision: `${(metrics.precision * 100).toFixed(1)}%`,
+      recall: `${(metrics.recall * 100).toFixed(1)}%`,
+      f1: `${(metrics.f1 * 100).toFixed(1)}%`,
+      support: metrics.support,
+    })),
+    [results]
+  );
+
   const handleRunEvaluation = async () => {
     if (!selectedDataset) {
       toast.error('Please select a dataset first');
@@ -1404,7 +1505,7 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
         trainPayload = { records: trainData };
       }
 
-      await api.post(trainEndpoint, trainPayload);
+      await api.post(trainEndpoint, trainPayload, LONG_REQUEST);
       
       toast.dismiss(evaluationToast);
       toast.success(`✅ Model trained with ${trainSize} samples`);
@@ -1423,7 +1524,7 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
         model_id: selectedModel,
         allowed_intents: uniqueIntents,
         include_rules: false,
-      });
+      }, LONG_REQUEST);
 
       // Extract predictions with confidence scores
       const predictionDetails = batchResponse.data.predictions.map(pred => ({
@@ -1451,22 +1552,32 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
 
       toast.dismiss(predictToast);
 
-      // Calculate metrics
-      const correct = predictions.filter((pred, idx) => pred === testLabels[idx]).length;
+      // Confusion matrix, per-label support/prediction counts and accuracy in a
+      // single pass over the test set (instead of several filters per intent)
+      const labelIndex = new Map(uniqueIntents.map((intent, i) => [intent, i]));
+      const confusionMatrix = uniqueIntents.map(() => new Array(uniqueIntents.length).fill(0));
+      const supportCounts = new Array(uniqueIntents.length).fill(0);
+      const predictedCounts = new Array(uniqueIntents.length).fill(0);
+      let correct = 0;
+      predictions.forEach((pred, idx) => {
+        const trueIdx = labelIndex.get(testLabels[idx]);
+        supportCounts[trueIdx]++;
+        if (pred === testLabels[idx]) correct++;
+        // Predictions outside the test labels (e.g. "unknown") count only against recall
+        const predIdx = labelIndex.get(pred);
+        if (predIdx !== undefined) {
+          confusionMatrix[trueIdx][predIdx]++;
+          predictedCounts[predIdx]++;
+        }
+      });
       const accuracy = correct / testLabels.length;
 
       // Calculate per-class metrics
       const intentMetrics = {};
-      uniqueIntents.forEach(intent => {
-        const truePositives = predictions.filter((pred, idx) => 
-          pred === intent && testLabels[idx] === intent
-        ).length;
-        const falsePositives = predictions.filter((pred, idx) => 
-          pred === intent && testLabels[idx] !== intent
-        ).length;
-        const falseNegatives = predictions.filter((pred, idx) => 
-          pred !== intent && testLabels[idx] === intent
-        ).length;
+      uniqueIntents.forEach((intent, i) => {
+        const truePositives = confusionMatrix[i][i];
+        const falsePositives = predictedCounts[i] - truePositives;
+        const falseNegatives = supportCounts[i] - truePositives;
 
         const precision = truePositives + falsePositives > 0 
           ? truePositives / (truePositives + falsePositives) 
@@ -1478,7 +1589,7 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
           ? 2 * (precision * recall) / (precision + recall) 
           : 0;
 
-        intentMetrics[intent] = { precision, recall, f1, support: testLabels.filter(l => l === intent).length };
+        intentMetrics[intent] = { precision, recall, f1, support: supportCounts[i] };
       });
 
       // Calculate weighted average
@@ -1505,15 +1616,6 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
         }))
         .filter(item => !item.correct);
 
-      // Build confusion matrix
-      const confusionMatrix = uniqueIntents.map(trueIntent => 
-        uniqueIntents.map(predIntent => 
-          predictions.filter((pred, idx) => 
-            testLabels[idx] === trueIntent && pred === predIntent
-          ).length
-        )
-      );
-
       const evaluationResults = {
         model_name: MODEL_OPTIONS.find(m => m.id === selectedModel)?.name,
         model_id: selectedModel,
@@ -1771,13 +1873,13 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
                   </tr>
                 </thead>
                 <tbody className="divide-y divide-gray-200">
-                  {Object.entries(results.per_class_metrics).map(([intent, metrics]) => (
-                    <tr key={intent} className="hover:bg-gray-50">
-                      <td className="px-4 py-2 font-medium text-gray-900">{intent}</td>
-                      <td className="px-4 py-2 text-gray-600">{(metrics.precision * 100).toFixed(1)}%</td>
-                      <td className="px-4 py-2 text-gray-600">{(metrics.recall * 100).toFixed(1)}%</td>
-                      <td className="px-4 py-2 text-gray-600">{(metrics.f1 * 100).toFixed(1)}%</td>
-                      <td className="px-4 py-2 text-gray-600">{metrics.support}</td>
+                  {perClassRows.map((row) => (
+                    <tr key={row.intent} className="hover:bg-gray-50">
+                      <td className="px-4 py-2 font-medium text-gray-900">{row.intent}</td>
+                      <td className="px-4 py-2 text-gray-600">{row.precision}</td>
+                      <td className="px-4 py-2 text-gray-600">{row.recall}</td>
+                      <td className="px-4 py-2 text-gray-600">{row.f1}</td>
+                      <td className="px-4 py-2 text-gray-600">{row.support}</td>
                     </tr>
                   ))}
                 </tbody>
@@ -1868,9 +1970,84 @@ const EvaluateTab = ({ onResultsReady, onAddToHistory }) => {
   );
 };
 
+// Helper function to get color based on value for confusion matrix
+const getColorIntensity = (value, maxValue, isDiagonal) => {
+  if (value === 0) return '#f9fafb'; // Light gray for zero values
+
+  // Red shades for mismatches (off-diagonal)
+  if (!isDiagonal && value > 0) {
+    const intensity = maxValue > 0 ? value / maxValue : 0;
+    const red = 255;
+    const green = Math.round(200 - (intensity * 150)); // Range from 200 to 50
+    const blue = Math.round(200 - (intensity * 150));
+    return `rgb(${red}, ${green}, ${blue})`;
+  }
+
+  // Blue shades for correct predictions (diagonal)
+  const intensity = maxValue > 0 ? value / maxValue : 0;
+  const blue = Math.round(255 - (intensity * 200)); // Range from 255 (light) to 55 (dark)
+  return `rgb(${blue}, ${blue + 20}, 255)`;
+};
+
+const getTextColor = (value, maxValue) => {
+  if (value === 0) return '#9ca3af'; // Gray text for zero
+
+  const intensity = maxValue > 0 ? value / maxValue : 0;
+  return intensity > 0.5 ? 'white' : 'black';
+};
+
+// Serialized intent comparison CSV per evaluation result; repeat downloads of
+// the same results reuse the Blob instead of re-serializing every sample
+const comparisonCsvCache = new WeakMap();
+
+const comparisonCsvBlob = (results) => {
+  let blob = comparisonCsvCache.get(results);
+  if (!blob) {
+    // Create CSV content
+    const headers = ['Text', 'True Intent', 'Predicted Intent', 'Correct'];
+    const rows = results.sample_predictions.map(item => [
+      item.text.replace(/"/g, '""'),
+      item.true,
+      item.predicted,
+      item.match ? 'Yes' : 'No'
+    ]);
+    
+    const csvContent = [
+      headers.join(','),
+      ...rows.map(row => row.map(cell => `"${cell}"`).join(','))
+    ].join('\n');
+
+    blob = new Blob([csvContent], { type: 'text/csv' });
+    comparisonCsvCache.set(results, blob);
+  }
+  return blob;
+};
+
 const MatrixComparisonTab = ({ results }) => {
   const [displayCount, setDisplayCount] = useState(null); // Start with null to show all by default
 
+  // Cell colours only depend on the evaluation results, so moving the rows
+  // slider re-renders the comparison table without recolouring the matrix
+  const matrixCells = useMemo(() => {
+    const matrix = results?.confusion_matrix;
+    if (!matrix) return null;
+
+    let maxValue = 0;
+    for (const row of matrix) {
+      for (const value of row) {
+        if (value > maxValue) maxValue = value;
+      }
+    }
+
+    return matrix.map((row, i) =>
+      row.map((value, j) => ({
+        value,
+        backgroundColor: getColorIntensity(value, maxValue, i === j), // Diagonal = correct predictions
+        color: getTextColor(value, maxValue),
+      }))
+    );
+  }, [results]);
+
   if (!results) {
     return (
       <div className="text-center py-12">
@@ -1890,36 +2067,10 @@ const MatrixComparisonTab = ({ results }) => {
     ? results.sample_predictions?.slice(0, displayCount) || []
     : results.sample_predictions || [];
 
-  // Helper function to get color based on value for confusion matrix
-  const getColorIntensity = (value, maxValue, isDiagonal) => {
-    if (value === 0) return '#f9fafb'; // Light gray for zero values
-    
-    // Red shades for mismatches (off-diagonal)
-    if (!isDiagonal && value > 0) {
-      const intensity = maxValue > 0 ? value / maxValue : 0;
-      const red = 255;
-      const green = Math.round(200 - (intensity * 150)); // Range from 200 to 50
-      const blue = Math.round(200 - (intensity * 150));
-      return `rgb(${red}, ${green}, ${blue})`;
-    }
-    
-    // Blue shades for correct predictions (diagonal)
-    const intensity = maxValue > 0 ? value / maxValue : 0;
-    const blue = Math.round(255 - (intensity * 200)); // Range from 255 (light) to 55 (dark)
-    return `rgb(${blue}, ${blue + 20}, 255)`;
-  };
-
-  const getTextColor = (value, maxValue, isDiagonal) => {
-    if (value === 0) return '#9ca3af'; // Gray text for zero
-    
-    const intensity = maxValue > 0 ? value / maxValue : 0;
-    return intensity > 0.5 ? 'white' : 'black';
-  };
-
   return (
     <div className="space-y-6">
       {/* Confusion Matrix */}
-      {results.confusion_matrix && results.labels && (
+      {matrixCells && results.labels && (
         <div className="card">
           <h3 className="text-lg font-semibold mb-4">🎯 Confusion Matrix</h3>
           <p className="text-sm text-gray-600 mb-4">
@@ -1946,31 +2097,25 @@ const MatrixComparisonTab = ({ results }) => {
                   </tr>
                 </thead>
                 <tbody>
-                  {results.confusion_matrix.map((row, i) => {
-                    const maxValue = Math.max(...results.confusion_matrix.flat());
-                    return (
-                      <tr key={i}>
-                        <td className="border border-gray-300 bg-gray-100 p-2 text-xs font-semibold text-gray-700">
-                          {results.labels[i]}
+                  {matrixCells.map((row, i) => (
+                    <tr key={i}>
+                      <td className="border border-gray-300 bg-gray-100 p-2 text-xs font-semibold text-gray-700">
+                        {results.labels[i]}
+                      </td>
+                      {row.map((cell, j) => (
+                        <td 
+                          key={j}
+                          className="border border-gray-300 p-2 text-center text-sm font-semibold"
+                          style={{
+                            backgroundColor: cell.backgroundColor,
+                            color: cell.color
+                          }}
+                        >
+                          {cell.value}
                         </td>
-                        {row.map((value, j) => {
-                          const isDiagonal = i === j; // Diagonal = correct predictions
-                          return (
-                            <td 
-                              key={j}
-                              className="border border-gray-300 p-2 text-center text-sm font-semibold"
-                              style={{
-                                backgroundColor: getColorIntensity(value, maxValue, isDiagonal),
-                                color: getTextColor(value, maxValue, isDiagonal)
-                              }}
-                            >
-                              {value}
-                            </td>
-                          );
-                        })}
-                      </tr>
-                    );
-                  })}
+                      ))}
+                    </tr>
+                  ))}
                 </tbody>
               </table>
             </div>
@@ -2013,7 +2158,7 @@ const MatrixComparisonTab = ({ results }) => {
           </div>
         )}
 
-        <div className="overflow-x-auto max-h-[600px] overflow-y-auto">
+        <div className="overflow-x-auto max-h-[600px] overflow-y-auto lazy-render">
           <table className="w-full text-sm">
             <thead className="bg-gray-50 sticky top-0 z-10">
               <tr>
@@ -2052,21 +2197,7 @@ const MatrixComparisonTab = ({ results }) => {
         <h3 className="text-lg font-semibold mb-4">📥 Download Results</h3>
         <button
           onClick={() => {
-            // Create CSV content
-            const headers = ['Text', 'True Intent', 'Predicted Intent', 'Correct'];
-            const rows = results.sample_predictions.map(item => [
-              item.text.replace(/"/g, '""'),
-              item.true,
-              item.predicted,
-              item.match ? 'Yes' : 'No'
-            ]);
-            
-            const csvContent = [
-              headers.join(','),
-              ...rows.map(row => row.map(cell => `"${cell}"`).join(','))
-            ].join('\n');
-
-            const blob = new Blob([csvContent], { type: 'text/csv' });
+            const blob = comparisonCsvBlob(results);
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
@@ -2234,15 +2365,20 @@ const ActiveLearningTab = ({ evaluationResults }) => {
   const [loading, setLoading] = useState(false);
   const [showCorrected, setShowCorrected] = useState(false);
   const [confidenceThreshold, setConfidenceThreshold] = useState(50);
+  // The slider label follows every drag step; the sample list catches up once dragging settles
+  const deferredThreshold = useDeferredValue(confidenceThreshold);
 
   // Get mismatched predictions from evaluation results
   const allMismatchedSamples = evaluationResults?.mismatches || [];
   
   // Filter by confidence threshold - show predictions with confidence below threshold
-  const mismatchedSamples = allMismatchedSamples.filter(sample => {
-    const confidence = sample.confidence || 0;
-    return (confidence * 100) < confidenceThreshold;
-  });
+  const mismatchedSamples = useMemo(
+    () => allMismatchedSamples.filter(sample => {
+      const confidence = sample.confidence || 0;
+      return (confidence * 100) < deferredThreshold;
+    }),
+    [allMismatchedSamples, deferredThreshold]
+  );
   
   const correctedCount = Object.keys(corrections).length;
 
@@ -2498,7 +2634,7 @@ const ActiveLearningTab = ({ evaluationResults }) => {
         {mismatchedSamples.length === 0 ? (
           <div className="text-center py-12">
             <p className="text-gray-500 mb-2">
-              🎯 No predictions found below {confidenceThreshold}% confidence threshold
+              🎯 No predictions found below {deferredThreshold}% confidence threshold
             </p>
             <p className="text-sm text-gray-400">
               Try adjusting the slider above to see more predictions
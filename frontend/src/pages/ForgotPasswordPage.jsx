@@ -1,20 +1,41 @@
-import { useState } from 'react';
+import { useState, useRef, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { toast } from 'react-hot-toast';
 import { authService } from '../services/authService';
+import { isTimeoutError, preconnectApi } from '../services/api';
 import { Loader } from '../components/common/Loader';
 import { CheckCircle } from 'lucide-react';
 
+// Minimum gap between OTP emails requested from this page
+const RESEND_COOLDOWN_MS = 30000;
+
+// Reject malformed input before it costs a round-trip (e.g. "a@b" passes the browser's email check)
+const EMAIL_RE = /^[^@\s]+@[^@\s]+\.[^@\s]+$/;
+const OTP_RE = /^\d{6}$/;
+
+const INITIAL_FORM = {
+  email: '',
+  otp: '',
+  newPassword: '',
+  confirmPassword: '',
+};
+
+const errorMessage = (error, fallback) =>
+  isTimeoutError(error)
+    ? 'Server timed out, please retry'
+    : error.response?.data?.detail || fallback;
+
 export const ForgotPasswordPage = () => {
   const [step, setStep] = useState(1); // 1: email, 2: otp, 3: new password
-  const [formData, setFormData] = useState({
-    email: '',
-    otp: '',
-    newPassword: '',
-    confirmPassword: '',
-  });
+  const [formData, setFormData] = useState(INITIAL_FORM);
   const [loading, setLoading] = useState(false);
   const [success, setSuccess] = useState(false);
+  const lastOtpSentAt = useRef(0);
+
+  // Warm the API connection while the user types their email
+  useEffect(() => {
+    preconnectApi();
+  }, []);
 
   const handleChange = (e) => {
     setFormData({
@@ -23,46 +44,54 @@ export const ForgotPasswordPage = () => {
     });
   };
 
-  const handleSendOTP = async (e) => {
-    e.preventDefault();
-    
-    if (!formData.email) {
-      toast.error('Please enter your email');
+  const sendOTP = async () => {
+    // Refuse repeat sends locally instead of hitting the API (and SMTP) again
+    const remaining = RESEND_COOLDOWN_MS - (Date.now() - lastOtpSentAt.current);
+    if (remaining > 0) {
+      toast.error(`Please wait ${Math.ceil(remaining / 1000)}s before requesting another OTP`);
       return;
     }
 
     setLoading(true);
     try {
       const response = await authService.forgotPassword(formData.email);
+      lastOtpSentAt.current = Date.now();
       toast.success(response.message || 'OTP sent to your email!');
       setStep(2);
     } catch (error) {
-      const message = error.response?.data?.detail || 'Failed to send OTP';
-      toast.error(message);
+      toast.error(errorMessage(error, 'Failed to send OTP'));
     } finally {
       setLoading(false);
     }
   };
 
-  const handleVerifyOTP = async (e) => {
+  const handleSendOTP = (e) => {
     e.preventDefault();
     
-    if (!formData.otp) {
-      toast.error('Please enter the OTP');
+    if (!formData.email) {
+      toast.error('Please enter your email');
       return;
     }
 
-    setLoading(true);
-    try {
-      const response = await authService.verifyOTP(formData.email, formData.otp);
-      toast.success(response.message || 'OTP verified successfully!');
-      setStep(3);
-    } catch (error) {
-      const message = error.response?.data?.detail || 'Invalid OTP';
-      toast.error(message);
-    } finally {
-      setLoading(false);
+    if (!EMAIL_RE.test(formData.email)) {
+      toast.error('Please enter a valid email address');
+      return;
+    }
+
+    sendOTP();
+  };
+
+  // The OTP is checked server-side by the reset call, so this step only
+  // validates its format and moves on without a round-trip
+  const handleVerifyOTP = (e) => {
+    e.preventDefault();
+    
+    if (!OTP_RE.test(formData.otp)) {
+      toast.error('Please enter the 6-digit OTP');
+      return;
     }
+
+    setStep(3);
   };
 
   const handleResetPassword = async (e) => {
@@ -88,13 +117,17 @@ export const ForgotPasswordPage = () => {
       const response = await authService.resetPassword(
         formData.email,
         formData.otp,
-        formData.newPassword
+        formData.newPassword,
+        formData.confirmPassword
       );
       toast.success(response.message || 'Password reset successfully!');
       setSuccess(true);
     } catch (error) {
-      const message = error.response?.data?.detail || 'Failed to reset password';
-      toast.error(message);
+      toast.error(errorMessage(error, 'Failed to reset password'));
+      // A wrong OTP only surfaces here now; send the user back to re-enter it
+      if (error.response?.data?.detail === 'Invalid OTP') {
+        setStep(2);
+      }
     } finally {
       setLoading(false);
     }
@@ -184,6 +217,15 @@ export const ForgotPasswordPage = () => {
               {loading ? <Loader size="sm" /> : 'Verify OTP'}
             </button>
 
+            <button
+              type="button"
+              onClick={sendOTP}
+              disabled={loading}
+              className="btn-secondary w-full"
+            >
+              Resend OTP
+            </button>
+
             <button
               type="button"
               onClick={() => setStep(1)}
@@ -2,37 +2,38 @@ import { Link } from 'react-router-dom';
 import { Bot, Database, LineChart, Shield, Zap } from 'lucide-react';
 import { useAuthStore } from '../store/authStore';
 
+// Static content, built once at module load rather than on every render
+const FEATURES = [
+  {
+    icon: Bot,
+    title: 'NLU Training',
+    description: 'Train powerful intent classification and entity recognition models',
+  },
+  {
+    icon: Database,
+    title: 'Dataset Management',
+    description: 'Upload, manage, and analyze your training datasets efficiently',
+  },
+  {
+    icon: LineChart,
+    title: 'Model Evaluation',
+    description: 'Evaluate and compare model performance with comprehensive metrics',
+  },
+  {
+    icon: Zap,
+    title: 'Active Learning',
+    description: 'Continuously improve models with intelligent active learning',
+  },
+  {
+    icon: Shield,
+    title: 'Admin Controls',
+    description: 'Manage users and workspaces with powerful admin tools',
+  },
+];
+
 export const HomePage = () => {
   const isAuthenticated = useAuthStore((state) => state.isAuthenticated);
 
-  const features = [
-    {
-      icon: Bot,
-      title: 'NLU Training',
-      description: 'Train powerful intent classification and entity recognition models',
-    },
-    {
-      icon: Database,
-      title: 'Dataset Management',
-      description: 'Upload, manage, and analyze your training datasets efficiently',
-    },
-    {
-      icon: LineChart,
-      title: 'Model Evaluation',
-      description: 'Evaluate and compare model performance with comprehensive metrics',
-    },
-    {
-      icon: Zap,
-      title: 'Active Learning',
-      description: 'Continuously improve models with intelligent active learning',
-    },
-    {
-      icon: Shield,
-      title: 'Admin Controls',
-      description: 'Manage users and workspaces with powerful admin tools',
-    },
-  ];
-
   return (
     <div className="min-h-screen">
       {/* Hero Section */}
@@ -75,9 +76,9 @@ export const HomePage = () => {
 
         {/* Features Grid */}
         <div className="mt-24 grid md:grid-cols-2 lg:grid-cols-3 gap-8">
-          {features.map((feature, index) => (
+          {FEATURES.map((feature) => (
             <div
-              key={index}
+              key={feature.title}
               className="card-hover text-center"
             >
               <div className="inline-flex items-center justify-center w-16 h-16 rounded-full mb-4" style={{ background: 'rgba(50, 244, 122, 0.15)', color: 'var(--accent)' }}>
@@ -6,6 +6,8 @@ import { authService } from '../services/authService';
 import { useAuthStore } from '../store/authStore';
 import { Loader } from '../components/common/Loader';
 
+const EMAIL_RE = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+
 export const LoginPage = () => {
   const navigate = useNavigate();
   const login = useAuthStore((state) => state.login);
@@ -69,8 +71,7 @@ export const LoginPage = () => {
     }
 
     // Email validation
-    const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
-    if (!emailRegex.test(formData.email)) {
+    if (!EMAIL_RE.test(formData.email)) {
       console.log('❌ Email format validation failed');
       toast.error('Please enter a valid email address', {
         duration: 3000,
@@ -85,6 +86,10 @@ export const LoginPage = () => {
     setLoading(true);
     const emailValue = formData.email;
 
+    // Fetch the lazily loaded dashboard chunk while /login is in flight, so
+    // the redirect after a successful login doesn't wait on a second download
+    import('./DashboardPage').catch(() => {});
+
     authService
       .login(formData.email, formData.password)
       .then((response) => {
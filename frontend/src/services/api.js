@@ -1,14 +1,41 @@
 import axios from 'axios';
 import { API_BASE_URL, APP_CONFIG } from '../config/config';
 
-// Create axios instance
+// Create axios instance (shared by every service so connections are reused)
 const api = axios.create({
   baseURL: API_BASE_URL,
+  timeout: APP_CONFIG.requestTimeoutMs,
   headers: {
     'Content-Type': 'application/json',
+    Accept: 'application/json',
   },
 });
 
+// Per-request config for training, evaluation, prediction, uploads and full
+// dataset downloads, which can legitimately run longer than the default timeout
+export const LONG_REQUEST = { timeout: 0 };
+
+// Per-request config for the short auth round-trips (login, OTP, password reset)
+export const AUTH_REQUEST = { timeout: APP_CONFIG.authRequestTimeoutMs };
+
+// Open the DNS/TCP/TLS connection to the API ahead of the first request
+// (e.g. while the user is still typing); added to <head> at most once
+let preconnected = false;
+export const preconnectApi = () => {
+  if (preconnected) return;
+  preconnected = true;
+  const link = document.createElement('link');
+  link.rel = 'preconnect';
+  link.href = new URL(API_BASE_URL, window.location.href).origin;
+  // axios sends CORS requests without credentials, so warm the anonymous pool
+  link.crossOrigin = 'anonymous';
+  document.head.appendChild(link);
+};
+
+// True when axios aborted the request because it hit its timeout
+export const isTimeoutError = (error) =>
+  error?.code === 'ECONNABORTED' || error?.code === 'ETIMEDOUT';
+
 // Request interceptor to add auth token
 api.interceptors.request.use(
   (config) => {
@@ -1,4 +1,4 @@
-import api from './api';
+import api, { AUTH_REQUEST } from './api';
 
 export const authService = {
   // Register new user
@@ -23,23 +23,18 @@ export const authService = {
 
   // Forgot password
   forgotPassword: async (email) => {
-    const response = await api.post('/forgot-password', { email });
+    const response = await api.post('/forgot-password', { email }, AUTH_REQUEST);
     return response.data;
   },
 
-  // Verify OTP
-  verifyOTP: async (email, otp) => {
-    const response = await api.post('/verify-otp', { email, otp });
-    return response.data;
-  },
-
-  // Reset password
-  resetPassword: async (email, otp, newPassword) => {
+  // Reset password (the OTP is verified server-side in the same request)
+  resetPassword: async (email, otp, newPassword, confirmPassword) => {
     const response = await api.post('/reset-password', {
       email,
       otp,
       new_password: newPassword,
-    });
+      confirm_password: confirmPassword,
+    }, AUTH_REQUEST);
     return response.data;
   },
 };
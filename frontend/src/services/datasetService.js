@@ -1,15 +1,33 @@
-import api from './api';
+import api, { LONG_REQUEST } from './api';
+
+// Last GET /datasets response, revalidated with If-None-Match
+let datasetsCache = { etag: null, data: null };
 
 export const datasetService = {
   // Upload dataset
   uploadDataset: async (payload) => {
-    const response = await api.post('/datasets', payload);
+    const response = await api.post('/datasets', payload, LONG_REQUEST);
+    // The save returns the refreshed history with its ETag; seed the GET cache
+    // so the next getDatasets() revalidates with a 304 instead of a full body
+    if (response.data.history && response.headers.etag) {
+      datasetsCache = { etag: response.headers.etag, data: response.data.history };
+    }
     return response.data;
   },
 
+  // Last known dataset history (from getDatasets or an upload), without a request
+  getCachedDatasets: () => datasetsCache.data,
+
   // Get all datasets
   getDatasets: async () => {
-    const response = await api.get('/datasets');
+    const response = await api.get('/datasets', {
+      headers: datasetsCache.etag ? { 'If-None-Match': datasetsCache.etag } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
+    if (response.status === 304) {
+      return datasetsCache.data;
+    }
+    datasetsCache = { etag: response.headers.etag || null, data: response.data };
     return response.data;
   },
 
@@ -23,7 +41,7 @@ export const datasetService = {
 
   // Get complete dataset
   getCompleteDataset: async (checksum) => {
-    const response = await api.get(`/datasets/complete/${checksum}`);
+    const response = await api.get(`/datasets/complete/${checksum}`, LONG_REQUEST);
     return response.data;
   },
 };
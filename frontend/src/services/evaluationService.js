@@ -1,9 +1,9 @@
-import api from './api';
+import api, { LONG_REQUEST } from './api';
 
 export const evaluationService = {
   // Run evaluation
   runEvaluation: async (evaluationData) => {
-    const response = await api.post('/run', evaluationData);
+    const response = await api.post('/run', evaluationData, LONG_REQUEST);
     return response.data;
   },
 
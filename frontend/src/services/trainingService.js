@@ -1,4 +1,4 @@
-import api from './api';
+import api, { LONG_REQUEST } from './api';
 
 export const trainingService = {
   // Start training
@@ -15,7 +15,7 @@ export const trainingService = {
 
   // Train with spaCy
   trainSpacy: async (trainingData) => {
-    const response = await api.post('/train/intent/spacy', trainingData);
+    const response = await api.post('/train/intent/spacy', trainingData, LONG_REQUEST);
     return response.data;
   },
 
@@ -24,7 +24,7 @@ export const trainingService = {
     const response = await api.post('/predict', {
       text,
       model_id: modelId,
-    });
+    }, LONG_REQUEST);
     return response.data;
   },
 
@@ -33,7 +33,7 @@ export const trainingService = {
     const response = await api.post('/predict/batch', {
       texts,
       model_id: modelId,
-    });
+    }, LONG_REQUEST);
     return response.data;
   },
 };
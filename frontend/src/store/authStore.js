@@ -2,13 +2,19 @@ import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
 import { APP_CONFIG } from '../config/config';
 
+// Single source of truth for the session keys: initial state, logout reset and persistence
+const SESSION_DEFAULTS = {
+  token: null,
+  user: null,
+  isAuthenticated: false,
+  loginTimestamp: null,
+};
+const SESSION_KEYS = Object.keys(SESSION_DEFAULTS);
+
 export const useAuthStore = create(
   persist(
     (set, get) => ({
-      token: null,
-      user: null,
-      isAuthenticated: false,
-      loginTimestamp: null,
+      ...SESSION_DEFAULTS,
 
       login: (token, user) => {
         // Prevent crashing on undefined token
@@ -34,12 +40,7 @@ export const useAuthStore = create(
       },
 
       logout: () => {
-        set({
-          token: null,
-          user: null,
-          isAuthenticated: false,
-          loginTimestamp: null,
-        });
+        set(SESSION_DEFAULTS);
         console.log('🔒 Logged out successfully');
       },
 
@@ -82,12 +83,7 @@ export const useAuthStore = create(
           sessionStorage.removeItem(name);
         },
       },
-      partialize: (state) => ({
-        token: state.token,
-        user: state.user,
-        isAuthenticated: state.isAuthenticated,
-        loginTimestamp: state.loginTimestamp,
-      }),
+      partialize: (state) => Object.fromEntries(SESSION_KEYS.map((key) => [key, state[key]])),
     }
   )
 );